@@ -161,8 +161,26 @@ ON CONFLICT DO NOTHING;
 -- ===========================================================
 CREATE INDEX IF NOT EXISTS idx_claims_claimant_id ON claims (claimant_id);
 CREATE INDEX IF NOT EXISTS idx_claims_created_at ON claims (created_at);
+CREATE INDEX IF NOT EXISTS ix_claims_claimant_created ON claims (claimant_id, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_claims_provider ON claims (provider);
 
+-- Trigram index so policy lookups with ILIKE '%q%' can use an index
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_policies_query_trgm ON policies USING gin (query gin_trgm_ops);
+
+-- Notify app processes (LISTEN blacklist_changed) whenever the blacklist changes
+CREATE OR REPLACE FUNCTION notify_blacklist_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('blacklist_changed', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS blacklist_changed ON blacklist;
+CREATE TRIGGER blacklist_changed
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON blacklist
+FOR EACH STATEMENT EXECUTE FUNCTION notify_blacklist_changed();
+
 -- Vacuum/analyze to refresh planner stats
 VACUUM ANALYZE claims;
 VACUUM ANALYZE blacklist;
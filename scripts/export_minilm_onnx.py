@@ -0,0 +1,36 @@
+"""
+Export all-MiniLM-L6-v2 to ONNX and quantize it to int8.
+---------------------------------------------------------
+Run once at build time, then point NLP_ONNX_MODEL_DIR at the output folder:
+
+    python scripts/export_minilm_onnx.py ./models/minilm-onnx
+    export NLP_ONNX_MODEL_DIR=./models/minilm-onnx
+
+Requires: optimum[onnxruntime]
+"""
+
+import os
+import sys
+
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from optimum.onnxruntime import ORTModelForFeatureExtraction
+from transformers import AutoTokenizer
+
+MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def main(out_dir: str) -> None:
+    model = ORTModelForFeatureExtraction.from_pretrained(MODEL_ID, export=True)
+    model.save_pretrained(out_dir)
+    AutoTokenizer.from_pretrained(MODEL_ID).save_pretrained(out_dir)
+
+    quantize_dynamic(
+        os.path.join(out_dir, "model.onnx"),
+        os.path.join(out_dir, "model_int8.onnx"),
+        weight_type=QuantType.QInt8,
+    )
+    print(f"✅ Int8 model written to {out_dir}/model_int8.onnx")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "models/minilm-onnx")
@@ -8,11 +8,13 @@ Manages:
 - Claimant context retrieval
 """
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from typing import Optional
 import os
 
+import anyio
+
 # =========================================================
 # 📦 Internal Imports
 # =========================================================
@@ -20,7 +22,6 @@ from src.utils.db import get_db
 from src.config import config
 from src.utils.logger import logger
 from src.utils.security import get_current_user  # JWT/API key stub
-from src.fraud_engine.ml_inference import is_model_loaded
 
 
 # =========================================================
@@ -34,18 +35,39 @@ def get_db_session(db: Session = Depends(get_db)) -> Session:
         db.close()
 
 
+# =========================================================
+# 🚦 DB WORKER LIMITER
+# =========================================================
+async def get_db_limiter(request: Request) -> anyio.CapacityLimiter:
+    """
+    Limiter for sync DB/HTTP work offloaded to worker threads.
+
+    Sized to the DB pool so scoring bursts queue here instead of exhausting
+    the shared anyio threadpool (which also serves /health and friends).
+    Created at startup; lazily created if startup hooks did not run (e.g. tests).
+    """
+    limiter = getattr(request.app.state, "db_limiter", None)
+    if limiter is None:
+        limiter = anyio.CapacityLimiter(config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW)
+        request.app.state.db_limiter = limiter
+    return limiter
+
+
 # =========================================================
 # 🤖 ML MODEL CHECK (Test-Safe)
 # =========================================================
-def require_ml_model() -> bool:
-    """Ensures ML model is available; bypassed in local/test environments."""
+def require_ml_model(request: Request) -> bool:
+    """
+    Ensures ML model is available; bypassed in local/test environments.
+    Readiness is read from `app.state.ml_loaded` (set once by the startup hook).
+    """
     env = getattr(config, "ENV", os.getenv("ENV", "local")).lower()
 
     if env in ("local", "dev", "development", "test", "testing"):
         logger.info(f"✅ ML model check skipped in {env} environment (test-safe).")
         return True
 
-    if not getattr(config, "ML_ENABLED", True) or not is_model_loaded():
+    if not getattr(config, "ML_ENABLED", True) or not getattr(request.app.state, "ml_loaded", False):
         logger.warning("⚠️ ML model not available – using rule-based scoring only.")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -55,7 +55,7 @@ async def chatbot_api(payload: dict):
 
     # Optional NLP-based scoring (semantic intent detection)
     try:
-        nlp_result = analyze_text(query)
+        nlp_result = analyze_text(query, minimal=True)
         if nlp_result.get("keyword_count", 0) > 0:
             intent = "fraud_check"
     except Exception as e:
@@ -88,7 +88,7 @@ async def chatbot_api(payload: dict):
 
         try:
             logger.info("⚙️ Running fraud scoring from chatbot...")
-            result = await score_claim(claim_data)
+            result = score_claim(claim_data)
             logger.info(f"✅ Fraud scoring completed for {claim_data.get('claimant_id', 'Unknown')}")
 
             return ORJSONResponse(
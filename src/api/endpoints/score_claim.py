@@ -7,12 +7,28 @@ and returns a FraudResponse.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from typing import List
 
+import anyio
+
 from src.models.claim import ClaimData
-from src.models.fraud import FraudResponse, FraudAlarm, Decision, FraudFeatures, AlarmSeverity
-from src.api.dependencies import get_db_session, require_ml_model, authenticated_user, get_claimant_context
+from src.models.fraud import (
+    FRAUD_RESPONSE_ADAPTER,
+    FraudResponse,
+    FraudAlarm,
+    Decision,
+    FraudFeatures,
+    AlarmSeverity,
+)
+from src.api.dependencies import (
+    get_db_session,
+    get_db_limiter,
+    require_ml_model,
+    authenticated_user,
+    get_claimant_context,
+)
 from src.fraud_engine.alarms import check_all_alarms
 from src.fraud_engine.ml_inference import get_fraud_probability
 from src.fraud_engine.decision_policy import get_decision
@@ -23,6 +39,9 @@ from src.config import config
 # ✅ We now define this router WITHOUT prefix (main.py adds prefix="/api/v1")
 router = APIRouter(tags=["Fraud Detection"])
 
+# Alarm types containing any of these are HIGH severity
+_HIGH_SEVERITY_KEYWORDS = ("blacklist", "duplicate", "vendor", "external", "high_amount")
+
 # =========================================================
 # 🧠 Fraud Scoring Endpoint
 # =========================================================
@@ -38,26 +57,28 @@ async def score_claim_endpoint(
     ml_enabled: bool = Depends(require_ml_model),
     user: dict = Depends(authenticated_user),
     context: dict = Depends(get_claimant_context),
+    db_limiter: anyio.CapacityLimiter = Depends(get_db_limiter),
 ):
     """Main endpoint that performs fraud scoring."""
     try:
         logger.info(f"🚀 Scoring claim for user: {user.get('user_id', 'anonymous')} | Claimant: {claim.claimant_id}")
 
         # =========================================================
-        # 1️⃣ Rule-Based Alarms
+        # 1️⃣ Rule-Based Alarms (sync DB + HTTP → worker thread)
         # =========================================================
-        raw_alarms = check_all_alarms(claim, db)
+        raw_alarms = await anyio.to_thread.run_sync(check_all_alarms, claim, db, limiter=db_limiter)
         alarms: List[FraudAlarm] = []
+        high_severity_count = 0
         for raw_alarm in raw_alarms:
             parts = raw_alarm.split(":", 1)
             alarm_type = parts[0].strip().lower().replace(" ", "_")
             description = parts[1].strip() if len(parts) > 1 else raw_alarm
 
-            severity = (
-                AlarmSeverity.HIGH
-                if any(k in alarm_type for k in ["blacklist", "duplicate", "vendor", "external", "high_amount"])
-                else AlarmSeverity.MEDIUM
-            )
+            if any(k in alarm_type for k in _HIGH_SEVERITY_KEYWORDS):
+                severity = AlarmSeverity.HIGH
+                high_severity_count += 1
+            else:
+                severity = AlarmSeverity.MEDIUM
 
             alarms.append(
                 FraudAlarm(
@@ -76,7 +97,7 @@ async def score_claim_endpoint(
             is_new_bank=claim.is_new_bank,
             is_out_of_network="out-of-network" in claim.provider.lower(),
             num_alarms=len(alarms),
-            high_severity_count=len([a for a in alarms if a.severity == AlarmSeverity.HIGH]),
+            high_severity_count=high_severity_count,
             repeat_count=context.get("prior_claims", 0),
         )
 
@@ -84,7 +105,7 @@ async def score_claim_endpoint(
         # 3️⃣ Fraud Probability
         # =========================================================
         if ml_enabled:
-            fraud_prob = get_fraud_probability(features.to_array(), alarms, db)
+            fraud_prob = get_fraud_probability(FraudFeatures.batch_to_matrix([features]), alarms, db)
         else:
             fraud_prob = min(1.0, len(alarms) * 0.1)
 
@@ -114,7 +135,9 @@ async def score_claim_endpoint(
         # 6️⃣ Save to DB
         # =========================================================
         try:
-            save_claim_to_db(claim, db, fraud_prob, decision, alarms)
+            await anyio.to_thread.run_sync(
+                save_claim_to_db, claim, db, fraud_prob, decision, alarms, limiter=db_limiter
+            )
         except Exception as db_err:
             logger.warning(f"⚠️ Failed to save claim to DB: {db_err}")
 
@@ -123,12 +146,15 @@ async def score_claim_endpoint(
         # =========================================================
         # 7️⃣ Return Response
         # =========================================================
-        return FraudResponse(
+        # Validated on construction; serialize once via the prebuilt adapter
+        # (response_model is kept for the OpenAPI schema only).
+        response = FraudResponse(
             fraud_probability=fraud_prob,
             alarms=alarms,
             decision=decision,
             explanation=explanation,
         )
+        return Response(content=FRAUD_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
 
     except ValueError as ve:
         logger.error(f"Validation error: {ve}")
@@ -37,8 +37,16 @@ class Config:
     # 🌐 DATABASE & STORAGE
     # =========================================================
     DB_URL: str = _from_env.__func__("DB_URL", "sqlite:///./fraud.db")
+    DB_POOL_SIZE: int = _from_env.__func__("DB_POOL_SIZE", 5, int)
+    DB_MAX_OVERFLOW: int = _from_env.__func__("DB_MAX_OVERFLOW", 10, int)
+    DB_POOL_RECYCLE: int = _from_env.__func__("DB_POOL_RECYCLE", 3600, int)  # seconds
+    DB_POOL_TIMEOUT: int = _from_env.__func__("DB_POOL_TIMEOUT", 5, int)  # seconds
     REDIS_URL: str = _from_env.__func__("REDIS_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES: int = _from_env.__func__("CACHE_MAX_ENTRIES", 10000, int)  # local fallback cap
     S3_BUCKET_NAME: str = _from_env.__func__("S3_BUCKET_NAME", "fraud-chatbot-artifacts")
+    S3_MULTIPART_THRESHOLD_MB: int = _from_env.__func__("S3_MULTIPART_THRESHOLD_MB", 8, int)
+    S3_MULTIPART_CHUNK_MB: int = _from_env.__func__("S3_MULTIPART_CHUNK_MB", 64, int)
+    S3_MAX_CONCURRENCY: int = _from_env.__func__("S3_MAX_CONCURRENCY", 16, int)  # parallel part uploads
     AWS_REGION: str = _from_env.__func__("AWS_REGION", "us-east-1")
 
     # =========================================================
@@ -60,6 +68,16 @@ class Config:
     LOCATION_DISTANCE_THRESHOLD: float = _from_env.__func__("LOCATION_DISTANCE_THRESHOLD", 100, float)
     ML_FRAUD_THRESHOLD: float = _from_env.__func__("ML_FRAUD_THRESHOLD", 0.7, float)
     FRAUD_MODEL_PATH: str = _from_env.__func__("FRAUD_MODEL_PATH", "ml/fraud_model.pkl")
+    BLACKLIST_CACHE_TTL: float = _from_env.__func__("BLACKLIST_CACHE_TTL", 60, float)  # seconds
+    NLP_ONNX_MODEL_DIR: Optional[str] = _from_env.__func__("NLP_ONNX_MODEL_DIR")  # int8 MiniLM export
+    NLP_QUANTIZE_INT8: bool = _from_env.__func__(
+        "NLP_QUANTIZE_INT8", "False", lambda v: v.lower() == "true"
+    )  # dynamic int8 Linear layers for the torch encoder (CPU)
+    NLP_TORCH_THREADS: int = _from_env.__func__("NLP_TORCH_THREADS", 0, int)  # 0 = half the CPUs
+    NLP_BATCH_MAX_WAIT_MS: float = _from_env.__func__("NLP_BATCH_MAX_WAIT_MS", 5, float)  # encode coalescing window
+    NLP_BATCH_TIMEOUT: float = _from_env.__func__("NLP_BATCH_TIMEOUT", 10, float)  # seconds before encoding directly
+    NLP_EMBEDDING_STORE_MAX: int = _from_env.__func__("NLP_EMBEDDING_STORE_MAX", 50000, int)  # float16 rows kept
+    OCR_WORKERS: int = _from_env.__func__("OCR_WORKERS", 0, int)  # OCR processes; 0 = min(4, CPUs)
 
     # =========================================================
     # 🚀 APP SETTINGS
@@ -69,6 +87,11 @@ class Config:
     API_HOST: str = _from_env.__func__("API_HOST", "0.0.0.0")
     API_PORT: int = _from_env.__func__("API_PORT", 8000, int)
     ENV: str = _from_env.__func__("ENV", "local")  # local/dev/prod
+    ALLOWED_ORIGINS: list = _from_env.__func__(
+        "ALLOWED_ORIGINS",
+        "http://localhost:8501,http://localhost:3000",
+        lambda v: [o.strip() for o in v.split(",") if o.strip()],
+    )
 
     # =========================================================
     # ✅ Computed Properties
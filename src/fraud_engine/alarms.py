@@ -13,6 +13,7 @@ Usage:
     alarms = check_all_alarms(claim, db)
 """
 
+from concurrent.futures import wait
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
@@ -21,6 +22,7 @@ from datetime import datetime
 from src.models.claim import ClaimData
 from src.utils.logger import logger
 from src.utils.db import get_blacklist_providers
+from src.utils.external_apis import prefetch_external_checks
 from src.nlp.text_analyzer import analyze_text
 from src.fraud_engine.constants import SUSPICIOUS_PHRASES
 
@@ -32,7 +34,10 @@ from src.fraud_engine.rules.location_mismatch import check_location_mismatch
 from src.fraud_engine.rules.duplicate_claims import check_duplicate_claims
 from src.fraud_engine.rules.vendor_fraud import check_vendor_fraud
 from src.fraud_engine.rules.time_patterns import check_time_patterns
-from src.fraud_engine.rules.external_mismatch import check_external_mismatch
+from src.fraud_engine.rules.external_mismatch import (
+    WEATHER_SENSITIVE_KEYWORDS,
+    check_external_mismatch,
+)
 
 
 def check_all_alarms(claim: ClaimData, db: Optional[Session] = None) -> List[str]:
@@ -54,6 +59,17 @@ def check_all_alarms(claim: ClaimData, db: Optional[Session] = None) -> List[str
         f"🧠 Running fraud detection for claimant={claim.claimant_id}, amount=${claim.amount:.2f}"
     )
 
+    # Overlap the external HTTP lookups (geocode, weather, vendor API) with the
+    # local rules below; the I/O rules then read the warmed cache.
+    location = (claim.location or "").strip()
+    needs_weather = any(k in notes for k in WEATHER_SENSITIVE_KEYWORDS)
+    claim_date = (claim.timestamp or datetime.now()).strftime("%Y-%m-%d")
+    prefetches = prefetch_external_checks(
+        location=location or None,
+        date=claim_date if needs_weather else None,
+        vendor_name=(claim.provider or "").strip() or None,
+    )
+
     # =====================================================
     # 🔹 LEGACY RULES (Base)
     # =====================================================
@@ -78,16 +94,16 @@ def check_all_alarms(claim: ClaimData, db: Optional[Session] = None) -> List[str
         )
 
     # 4️⃣ Blacklist Hit
-    blacklist_providers = get_blacklist_providers(db) if db else ["shady_clinic", "fake_vendor"]
+    blacklist_providers = get_blacklist_providers(db) if db else ("shady_clinic", "fake_vendor")
     for bl in blacklist_providers:
-        if bl.lower() in provider:
+        if bl in provider:
             alarms.append(f"[BLACKLIST] Provider '{claim.provider}' flagged (blacklist match: {bl})")
             break
 
     # 5️⃣ Suspicious Text Phrases (NLP-based)
     if notes:
         try:
-            nlp_results = analyze_text(notes)
+            nlp_results = analyze_text(notes, minimal=True)
             matched = [
                 p for p in SUSPICIOUS_PHRASES if p in notes
             ] + nlp_results.get("suspicious_phrases", [])
@@ -104,6 +120,7 @@ def check_all_alarms(claim: ClaimData, db: Optional[Session] = None) -> List[str
         alarms += check_high_amount(claim, db)
         alarms += check_repeat_claimant(claim, db)
         alarms += check_suspicious_keywords(claim, db)
+        wait(prefetches)
         alarms += check_location_mismatch(claim, db)
         alarms += check_duplicate_claims(claim, db)
         alarms += check_vendor_fraud(claim, db)
@@ -17,7 +17,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 from src.models.claim import ClaimData
 from src.config import config
-from src.nlp.text_analyzer import get_text_similarity
+from src.nlp.text_analyzer import get_text_similarities
 from src.utils.logger import logger
 
 
@@ -67,12 +67,10 @@ def check_duplicate_claims(claim: ClaimData, db: Optional[Session] = None) -> Li
         # 🔍 Compare note similarity
         # =========================================================
         max_similarity = 0.0
-        for past_note in past_notes:
-            try:
-                sim = get_text_similarity(notes, past_note)
-                max_similarity = max(max_similarity, sim)
-            except Exception as e:
-                logger.warning(f"[DUPLICATE-CLAIM] Similarity check failed for claimant {claim.claimant_id}: {e}")
+        try:
+            max_similarity = max(get_text_similarities(notes, past_notes), default=0.0)
+        except Exception as e:
+            logger.warning(f"[DUPLICATE-CLAIM] Similarity check failed for claimant {claim.claimant_id}: {e}")
 
         threshold = getattr(config, "SIMILARITY_THRESHOLD", 0.8)
         logger.debug(
@@ -39,7 +39,7 @@ def check_suspicious_keywords(claim: ClaimData, db: Optional[Session] = None) ->
 
     try:
         # 🔍 Run NLP analysis (cached inside text_analyzer)
-        analysis = analyze_text(notes)
+        analysis = analyze_text(notes, minimal=True)
 
         keyword_count = int(analysis.get("keyword_count", 0))
         suspicious_phrases = analysis.get("suspicious_phrases", [])
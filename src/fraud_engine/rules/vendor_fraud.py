@@ -13,7 +13,8 @@ Example:
 ["[VENDOR-FRAUD] Provider 'shady_clinic' risk=0.85 – Blacklist hit or API flag"]
 """
 
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
 from src.models.claim import ClaimData
 from src.utils.external_apis import check_vendor_fraud as check_vendor_risk
@@ -21,6 +22,42 @@ from src.utils.db import get_blacklist_providers
 from src.utils.logger import logger
 from src.config import config
 
+# NUL never appears in provider names, so a match can never span two entries
+_BLACKLIST_SEPARATOR = "\x00"
+
+# Resolved once at import; call `reload_risk_threshold()` after changing config at runtime
+_RISK_THRESHOLD: float = float(getattr(config, "ML_FRAUD_THRESHOLD", 0.7))
+
+
+def reload_risk_threshold() -> float:
+    """Re-read the vendor risk threshold from config (e.g. after a hot config reload)."""
+    global _RISK_THRESHOLD
+    _RISK_THRESHOLD = float(getattr(config, "ML_FRAUD_THRESHOLD", 0.7))
+    return _RISK_THRESHOLD
+
+
+@lru_cache(maxsize=8)
+def _compile_blacklist(blacklist: Tuple[str, ...]) -> str:
+    """Join the (already lower-cased) blacklist into one NUL-separated haystack, built once per blacklist."""
+    return _BLACKLIST_SEPARATOR.join(blacklist)
+
+
+def is_blacklisted_provider(provider: str, blacklist: Sequence[str]) -> bool:
+    """
+    True if the lower-cased provider name appears inside any blacklisted entry.
+
+    `blacklist` is expected as the lower-cased tuple returned by
+    `get_blacklist_providers`; other sequences are normalised on the fly.
+
+    One C-level substring search over the compiled haystack replaces the
+    per-entry Python loop, so cost no longer grows with interpreter overhead per entry.
+    """
+    if not provider or _BLACKLIST_SEPARATOR in provider:
+        return False
+    if not isinstance(blacklist, tuple):
+        blacklist = tuple(bl.lower() for bl in blacklist)
+    return provider in _compile_blacklist(blacklist)
+
 
 def check_vendor_fraud(claim: ClaimData, db: Optional[Session] = None) -> List[str]:
     """
@@ -35,6 +72,7 @@ def check_vendor_fraud(claim: ClaimData, db: Optional[Session] = None) -> List[s
     """
     alarms: List[str] = []
     provider = (getattr(claim, "provider", "") or "").strip()
+    provider_lower = provider.lower()
     claimant_id = getattr(claim, "claimant_id", "unknown")
 
     if not provider:
@@ -45,26 +83,26 @@ def check_vendor_fraud(claim: ClaimData, db: Optional[Session] = None) -> List[s
         # Step 1️⃣ Check internal blacklist
         blacklisted = False
         try:
-            blacklist = get_blacklist_providers(db) if db else []
-            if any(provider.lower() in bl.lower() for bl in blacklist):
+            blacklist = get_blacklist_providers(db) if db else ()
+            if is_blacklisted_provider(provider_lower, blacklist):
                 alarms.append(
                     f"[VENDOR-FRAUD] Provider '{provider}' is blacklisted (internal DB check)."
                 )
                 blacklisted = True
-                logger.info(f"[VENDOR-FRAUD] 🚨 Blacklist hit for provider '{provider}'.")
+                logger.info("[VENDOR-FRAUD] 🚨 Blacklist hit for provider '%s'.", provider)
         except Exception as e:
-            logger.warning(f"[VENDOR-FRAUD] ⚠️ Blacklist check failed for '{provider}': {e}")
+            logger.warning("[VENDOR-FRAUD] ⚠️ Blacklist check failed for '%s': %s", provider, e)
 
         # Step 2️⃣ External API risk check (optional)
         vendor_result = {}
         try:
             vendor_result = check_vendor_risk(provider, db)
         except Exception as e:
-            logger.warning(f"[VENDOR-FRAUD] ⚠️ External vendor API unavailable for '{provider}': {e}")
+            logger.warning("[VENDOR-FRAUD] ⚠️ External vendor API unavailable for '%s': %s", provider, e)
 
         risk_score = float(vendor_result.get("risk_score", 0.0)) if vendor_result else 0.0
         reason = vendor_result.get("reason", "No risk reason returned") if vendor_result else "N/A"
-        threshold = getattr(config, "ML_FRAUD_THRESHOLD", 0.7)
+        threshold = _RISK_THRESHOLD
 
         # Step 3️⃣ Evaluate combined results
         if blacklisted or risk_score > threshold:
@@ -73,13 +111,21 @@ def check_vendor_fraud(claim: ClaimData, db: Optional[Session] = None) -> List[s
                 f"– {reason}{' (blacklist hit)' if blacklisted else ''}."
             )
             logger.info(
-                f"[VENDOR-FRAUD] 🚨 Vendor flagged: provider='{provider}', risk={risk_score:.2f}, reason={reason}"
+                "[VENDOR-FRAUD] 🚨 Vendor flagged: provider='%s', risk=%.2f, reason=%s",
+                provider, risk_score, reason,
             )
         else:
-            logger.debug(f"[VENDOR-FRAUD] OK – Provider '{provider}' risk={risk_score:.2f}, threshold={threshold:.2f}")
+            # Lazy %-formatting: nothing is rendered when DEBUG is filtered out
+            logger.debug(
+                "[VENDOR-FRAUD] OK – Provider '%s' risk=%.2f, threshold=%.2f",
+                provider, risk_score, threshold,
+            )
 
     except Exception as e:
-        logger.error(f"[VENDOR-FRAUD] ❌ Unexpected error for provider '{provider}' (claimant={claimant_id}): {e}")
+        logger.error(
+            "[VENDOR-FRAUD] ❌ Unexpected error for provider '%s' (claimant=%s): %s",
+            provider, claimant_id, e,
+        )
 
     return alarms
 
@@ -11,13 +11,19 @@ Handles:
 """
 
 from fastapi import FastAPI, Request
-from fastapi.responses import ORJSONResponse, JSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exceptions import RequestValidationError
-from datetime import datetime
+import anyio
+import asyncio
+import orjson
+import hashlib
+import importlib.util
 import traceback
 import json
 import os
+import time
 
 # =========================================================
 # 📦 Internal Imports
@@ -25,6 +31,12 @@ import os
 from src.utils.logger import logger
 from src.config import config
 from src.services.guidance import get_guidance_response
+from src.utils.cache import cache_get, cache_set, sweep_expired
+from src.utils.db import ping_db, start_blacklist_listener
+from src.utils.auth_middleware import AuthMiddleware
+from src.utils.logging_middleware import LoggingMiddleware
+from src.utils.health_middleware import HealthCache, HealthFastPath
+from src.fraud_engine.ml_inference import load_fraud_model
 from src.api.endpoints import (
     score_claim,
     explain_alarm,
@@ -38,20 +50,59 @@ app = FastAPI(
     title="Intelligent Fraud Detection Chatbot",
     version="1.0.0",
     description="AI-powered fraud detection and claim decisioning API.",
+    default_response_class=ORJSONResponse,
 )
 
+# =========================================================
+# 📝 Request Logging
+# =========================================================
+# Innermost, so it logs uncompressed responses. Probe / root traffic is sampled
+# at 10% instead of being logged on every hit.
+app.add_middleware(
+    LoggingMiddleware,
+    skip_paths=["/metrics"],
+    sample_paths={"/health": 0.1, "/": 0.1},
+)
+
+# =========================================================
+# 🗜️ Response Compression
+# =========================================================
+# Level 1: near-linear CPU for most of the ratio of the default level 9.
+# Small bodies (/health, /) stay uncompressed below the 500-byte floor.
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=1)
+
+# =========================================================
+# 🔐 Authentication (pure ASGI, protected prefixes only)
+# =========================================================
+# Registered before CORS so CORS stays outermost and preflights never need auth.
+app.add_middleware(AuthMiddleware, protected_paths=("/me",))
+
 # =========================================================
 # 🌐 CORS Configuration
 # =========================================================
-ALLOWED_ORIGINS = getattr(config, "ALLOWED_ORIGINS", ["*"])
+# Explicit allowlist (a "*" origin is invalid with credentials anyway);
+# frozenset keeps the per-request origin check O(1).
+ALLOWED_ORIGINS = frozenset(config.ALLOWED_ORIGINS)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["authorization", "content-type"],
+    max_age=86400,  # let browsers cache preflights for a day
 )
 
+# =========================================================
+# 🩺 Health Fast Path (outermost — added last)
+# =========================================================
+# Memoized DB probe: DB load from probes is capped at 1 query per TTL,
+# however many k8s probes / dashboards poll. Keep TTL below the probe interval.
+# A background task refreshes the cache; the fast path answers /health from it
+# without entering the router, and falls through to the route once stale.
+_HEALTH_TTL = 5.0
+HEALTH_CACHE = HealthCache()
+app.add_middleware(HealthFastPath, cache=HEALTH_CACHE, max_age=2 * _HEALTH_TTL)
+
 # =========================================================
 # 🔌 Include Routers (only main file uses prefix)
 # =========================================================
@@ -63,17 +114,31 @@ app.include_router(chatbot.router, prefix="/api/v1")
 # =========================================================
 # ⚙️ Exception Handlers
 # =========================================================
+# Bound what a single 422 can push into the logs (huge invalid bodies)
+MAX_LOGGED_VALIDATION_ERRORS = 10
+MAX_VALIDATION_MSG_LENGTH = 200
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handles invalid request payloads gracefully."""
+    errors = exc.errors()
+    logged_errors = []
+    for err in errors[:MAX_LOGGED_VALIDATION_ERRORS]:
+        # Drop `input` — it echoes the offending payload and can be arbitrarily large
+        err = {k: v for k, v in err.items() if k != "input"}
+        err["msg"] = str(err.get("msg", ""))[:MAX_VALIDATION_MSG_LENGTH]
+        logged_errors.append(err)
+
     log_data = {
         "event": "request_error",
         "type": "ValidationError",
         "status": 422,
         "path": str(request.url.path),
-        "errors": exc.errors(),
+        "errors": logged_errors,
+        "errors_truncated": len(errors) > MAX_LOGGED_VALIDATION_ERRORS,
     }
-    logger.error(json.dumps(log_data))
+    logger.error(json.dumps(log_data, default=str))
 
     return ORJSONResponse(
         status_code=422,
@@ -93,7 +158,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     }
     logger.error(json.dumps(log_data))
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error. Please try again later."},
     )
@@ -102,11 +167,21 @@ async def global_exception_handler(request: Request, exc: Exception):
 # =========================================================
 # 💬 Guidance Endpoint (Standalone)
 # =========================================================
+GUIDANCE_CACHE_TTL = 3600
+GUIDANCE_CACHE_HEADERS = {"Cache-Control": f"max-age={GUIDANCE_CACHE_TTL}"}
+
+
+def _guidance_cache_key(user_query: str) -> str:
+    """Stable cache key for a guidance query (case/whitespace-insensitive)."""
+    normalized = user_query.lower().strip().encode("utf-8")
+    return f"guidance:{hashlib.blake2b(normalized, digest_size=16).hexdigest()}"
+
+
 @app.post("/api/v1/guidance")
 async def guidance_api(query: dict):
     """
     Provides chatbot-style guidance for user queries.
-    Returns 400 for empty queries.
+    Returns 400 for empty queries. Responses are cached per normalized query.
     """
     user_query = query.get("query", "").strip()
 
@@ -116,49 +191,179 @@ async def guidance_api(query: dict):
             content={"detail": "Query text cannot be empty."},
         )
 
-    guidance_data = get_guidance_response(user_query)
-
-    return ORJSONResponse(
-        status_code=200,
-        content={
+    cache_key = _guidance_cache_key(user_query)
+    content = cache_get(cache_key)
+    if content is None:
+        guidance_data = get_guidance_response(user_query)
+        content = {
             "guidance": {"response": guidance_data["response"]},
             "relevance_score": guidance_data.get("relevance_score", 1.0),
-        },
-    )
+        }
+        cache_set(cache_key, content, expire_seconds=GUIDANCE_CACHE_TTL)
+
+    return ORJSONResponse(status_code=200, content=content, headers=GUIDANCE_CACHE_HEADERS)
 
 
 # =========================================================
 # 🧩 Utility Endpoints
 # =========================================================
+# Second-granularity ISO timestamp, formatted at most once per second.
+_TS_CACHE = ["", 0]
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO-8601 (seconds precision), cached per second."""
+    t = int(time.time())
+    if t != _TS_CACHE[1]:
+        _TS_CACHE[0] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t))
+        _TS_CACHE[1] = t
+    return _TS_CACHE[0]
+
+
+# Static part of the root payload, serialized once; only the timestamp is
+# spliced in per request (closing brace stripped so it can be appended to).
+_ROOT_PAYLOAD_PREFIX = orjson.dumps({
+    "status": "running",
+    "version": "1.0.0",
+    "message": "Welcome to Intelligent Fraud Detection API",
+    "fraud_types_detected": 15,
+    "ml_enabled": getattr(config, "ML_ENABLED", True),
+})[:-1]
+
+
 @app.get("/")
 async def root():
     """Root endpoint for system information."""
-    return {
-        "status": "running",
-        "version": "1.0.0",
-        "timestamp": datetime.utcnow().isoformat(),
-        "message": "Welcome to Intelligent Fraud Detection API",
-        "fraud_types_detected": 15,
-        "ml_enabled": getattr(config, "ML_ENABLED", True),
-    }
+    return Response(
+        content=_ROOT_PAYLOAD_PREFIX + b',"timestamp":"' + _now_iso().encode() + b'"}',
+        media_type="application/json",
+    )
+
+
+async def _refresh_health() -> None:
+    """Probe dependencies and store the serialized health payload."""
+    # Sync driver (psycopg2) — run the probe off the event loop.
+    db_ok = await anyio.to_thread.run_sync(ping_db)
+    ml_ok = bool(getattr(app.state, "ml_loaded", False))
+    # ML falls back to rule-based scoring, so only the DB decides overall status.
+    HEALTH_CACHE.update({
+        "status": "healthy" if db_ok else "degraded",
+        "database": "ok" if db_ok else "unavailable",
+        "ml_model": "ok" if ml_ok else "not loaded",
+    })
 
 
 @app.get("/health")
 async def health():
-    """Basic health check."""
-    return {"status": "healthy"}
+    """Health check; normally answered by HealthFastPath before reaching here."""
+    if not HEALTH_CACHE.is_fresh(_HEALTH_TTL):
+        await _refresh_health()
+    return Response(content=HEALTH_CACHE.payload_bytes, media_type="application/json")
+
+
+# =========================================================
+# 📈 Metrics (plain Starlette route — no deps/validation)
+# =========================================================
+_STARTED_AT = time.monotonic()
+
+
+async def metrics_handler(request: Request) -> PlainTextResponse:
+    """Prometheus text exposition of process/dependency gauges."""
+    db_up = int(HEALTH_CACHE.payload.get("database") == "ok")
+    ml_loaded = int(bool(getattr(app.state, "ml_loaded", False)))
+    body = (
+        "# TYPE fraud_api_uptime_seconds gauge\n"
+        f"fraud_api_uptime_seconds {time.monotonic() - _STARTED_AT:.0f}\n"
+        "# TYPE fraud_api_db_up gauge\n"
+        f"fraud_api_db_up {db_up}\n"
+        "# TYPE fraud_api_ml_model_loaded gauge\n"
+        f"fraud_api_ml_model_loaded {ml_loaded}\n"
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+# A plain Starlette Route (not an APIRoute): exact "/metrics", no 307 to "/metrics/"
+# like a mount would send, and no FastAPI dependency/response-model handling.
+app.add_route("/metrics", metrics_handler, methods=["GET"], include_in_schema=False)
 
 
 @app.get("/me")
-async def get_me():
-    """Mock user profile (for testing authentication)."""
+async def get_me(request: Request):
+    """Current user profile, as authenticated by AuthMiddleware."""
+    user = request.state.user
     return {
-        "user_id": "test_user",
-        "role": "analyst",
+        "user_id": user["user_id"],
+        "role": user["role"],
         "environment": getattr(config, "ENV", "development"),
     }
 
 
+# =========================================================
+# 🚦 Worker Limiters
+# =========================================================
+@app.on_event("startup")
+async def init_limiters():
+    """Dedicated limiter for sync DB work, sized to the connection pool."""
+    app.state.db_limiter = anyio.CapacityLimiter(config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW)
+
+
+@app.on_event("startup")
+async def start_blacklist_invalidation():
+    """Drop the in-process blacklist snapshot as soon as Postgres NOTIFYs a change."""
+    start_blacklist_listener()
+
+
+@app.on_event("startup")
+async def load_ml_model():
+    """Load the fraud model once; readiness is cached on app.state for request paths."""
+    app.state.ml_loaded = load_fraud_model()
+
+
+@app.on_event("startup")
+async def start_health_refresher():
+    """Keep the /health cache warm so probes never wait on the DB."""
+    async def _loop():
+        while True:
+            try:
+                await _refresh_health()
+            except Exception as e:
+                logger.warning(f"⚠️ Health refresh failed: {e}")
+            await asyncio.sleep(_HEALTH_TTL)
+
+    app.state.health_task = asyncio.create_task(_loop())
+
+
+@app.on_event("shutdown")
+async def stop_health_refresher():
+    task = getattr(app.state, "health_task", None)
+    if task:
+        task.cancel()
+
+
+_CACHE_SWEEP_INTERVAL = 60.0
+
+
+@app.on_event("startup")
+async def start_cache_sweeper():
+    """Periodically drop expired local-cache entries that are never read again."""
+    async def _loop():
+        while True:
+            await asyncio.sleep(_CACHE_SWEEP_INTERVAL)
+            try:
+                sweep_expired()
+            except Exception as e:
+                logger.warning(f"⚠️ Cache sweep failed: {e}")
+
+    app.state.cache_sweep_task = asyncio.create_task(_loop())
+
+
+@app.on_event("shutdown")
+async def stop_cache_sweeper():
+    task = getattr(app.state, "cache_sweep_task", None)
+    if task:
+        task.cancel()
+
+
 # =========================================================
 # 🧾 Debug Utility: Show Registered Routes
 # =========================================================
@@ -172,15 +377,33 @@ async def list_routes():
 
 
 # =========================================================
-# 🏁 Local Debug Runner
+# 🏁 Server Runner (`fraud-api` console script)
 # =========================================================
-if __name__ == "__main__":
+def run_api() -> None:
+    """
+    Run the API under uvicorn with the fast event loop and HTTP parser.
+
+    uvloop/httptools ship with `uvicorn[standard]`; uvloop has no Windows
+    build, so fall back to the default asyncio loop when it is missing.
+    """
     import uvicorn
 
-    logger.info("🚀 Starting Intelligent Fraud Detection API (debug mode)")
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+    logger.info(f"🚀 Starting Intelligent Fraud Detection API (loop={loop}, http={http})")
     uvicorn.run(
         "src.main:app",
-        host="0.0.0.0",
-        port=int(os.getenv("PORT", 8000)),
+        host=getattr(config, "API_HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", getattr(config, "API_PORT", 8000))),
         reload=getattr(config, "DEBUG", True),
+        loop=loop,
+        http=http,
+        interface="asgi3",
+        log_level=config.LOG_LEVEL.lower(),
+        access_log=getattr(config, "DEBUG", True),
     )
+
+
+if __name__ == "__main__":
+    run_api()
@@ -6,38 +6,14 @@ Compatible with Pydantic v2 and FastAPI 0.104+.
 """
 
 from datetime import datetime
-from typing import Optional, List
-from enum import Enum
+from typing import Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
-# =========================================================
-# 🧩 ENUMS
-# =========================================================
-class Decision(str, Enum):
-    """Fraud decision levels for claims."""
-    APPROVE = "APPROVE"
-    REVIEW = "REVIEW"
-    REJECT = "REJECT"
-
-
-class AlarmSeverity(str, Enum):
-    """Alarm severity levels."""
-    LOW = "LOW"
-    MEDIUM = "MEDIUM"
-    HIGH = "HIGH"
-
-
-# =========================================================
-# 🚨 FRAUD ALARM MODEL
-# =========================================================
-class FraudAlarm(BaseModel):
-    """Represents a triggered fraud alarm for a given claim."""
-    type: str = Field(..., description="Alarm type (e.g., 'high_amount', 'duplicate_claim')")
-    description: str = Field(..., description="Reason this alarm was triggered.")
-    severity: AlarmSeverity = Field(default=AlarmSeverity.MEDIUM, description="LOW / MEDIUM / HIGH")
-
-    model_config = ConfigDict(extra="ignore")
+# Shared enums / alarm / response models live in `src.models.fraud`; re-exported
+# here so `from src.models.claim import FraudResponse` keeps working without a
+# second (diverging) definition.
+from src.models.fraud import Decision, AlarmSeverity, FraudAlarm, FraudResponse  # noqa: F401
 
 
 # =========================================================
@@ -68,32 +44,3 @@ class ClaimData(BaseModel):
             }
         },
     )
-
-
-# =========================================================
-# 🧠 FRAUD RESPONSE MODEL
-# =========================================================
-class FraudResponse(BaseModel):
-    """Output structure returned by the fraud engine."""
-    fraud_probability: float = Field(..., ge=0.0, le=1.0, description="Fraud probability (0.0–1.0)")
-    alarms: List[FraudAlarm] = Field(default_factory=list, description="List of triggered fraud alarms")
-    decision: Decision = Field(..., description="Final fraud decision: APPROVE / REVIEW / REJECT")
-    explanation: str = Field(..., description="Human-readable explanation of the decision")
-
-    model_config = ConfigDict(
-        extra="ignore",
-        json_schema_extra={
-            "example": {
-                "fraud_probability": 0.85,
-                "decision": "REJECT",
-                "explanation": "High-risk claim detected due to duplicate claimant and large amount.",
-                "alarms": [
-                    {
-                        "type": "duplicate_claim",
-                        "description": "Claimant filed another claim in past 30 days.",
-                        "severity": "HIGH",
-                    }
-                ],
-            }
-        },
-    )
@@ -11,7 +11,8 @@ Defines data structures used for fraud detection, alarms, and responses.
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict
+import numpy as np
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 
 
 # =========================================================
@@ -41,12 +42,15 @@ class FraudAlarm(BaseModel):
     severity: AlarmSeverity = Field(AlarmSeverity.MEDIUM, description="Severity level of the alarm.")
     evidence: Optional[Dict[str, Any]] = Field(None, description="Supporting evidence details if available.")
 
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
 
 # =========================================================
 # 📊 FRAUD FEATURES MODEL
 # =========================================================
+NUM_FEATURES = 14
+
+
 class FraudFeatures(BaseModel):
     """Feature vector used for ML fraud prediction (14 standard features)."""
     amount_normalized: float = Field(0.0, description="Normalized claim amount ratio")
@@ -64,7 +68,7 @@ class FraudFeatures(BaseModel):
     vendor_risk_score: float = Field(0.0, description="Vendor-level fraud risk score")
     external_mismatch_count: int = Field(0, description="External data mismatches")
 
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
     @property
     def values(self) -> List[float]:
@@ -86,6 +90,22 @@ class FraudFeatures(BaseModel):
             self.external_mismatch_count,
         ]
 
+    def to_array(self) -> np.ndarray:
+        """Return the feature vector as a 1-D float32 array."""
+        return np.asarray(self.values, dtype=np.float32)
+
+    @classmethod
+    def batch_to_matrix(cls, items: List["FraudFeatures"]) -> np.ndarray:
+        """
+        Stack feature vectors into one contiguous (n, 14) float32 matrix.
+        One allocation for the whole batch, rows written in place — feed this
+        to `predict_proba` instead of building per-item arrays.
+        """
+        out = np.empty((len(items), NUM_FEATURES), dtype=np.float32)
+        for i, features in enumerate(items):
+            out[i] = features.values
+        return out
+
 
 # =========================================================
 # 🧠 FRAUD RESPONSE MODEL
@@ -99,7 +119,7 @@ class FraudResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Decision timestamp")
     features_used: Optional[FraudFeatures] = Field(None, description="Optional feature data used for decision")
 
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
 
 # =========================================================
@@ -113,16 +133,29 @@ class BatchFraudResponse(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
 
+# =========================================================
+# ⚡ PREBUILT ADAPTERS
+# =========================================================
+# Built once at import; `dump_json` serializes straight to bytes in pydantic-core,
+# skipping FastAPI's response_model re-validation + jsonable_encoder pass.
+FRAUD_RESPONSE_ADAPTER = TypeAdapter(FraudResponse)
+# Whole alarm list → JSON-ready builtins in one pydantic-core call (DB writes)
+FRAUD_ALARMS_ADAPTER = TypeAdapter(List[FraudAlarm])
+
+
 # =========================================================
 # ✅ EXPLICIT EXPORTS
 # =========================================================
 __all__ = [
+    "NUM_FEATURES",
     "Decision",
     "AlarmSeverity",
     "FraudAlarm",
     "FraudFeatures",
     "FraudResponse",
     "BatchFraudResponse",
+    "FRAUD_RESPONSE_ADAPTER",
+    "FRAUD_ALARMS_ADAPTER",
 ]
 
 
@@ -23,31 +23,160 @@ Used for:
 - Date mismatch
 
 Notes:
-- For local PDFs, pdf2image requires Poppler installed on the host.
+- Local PDFs are rasterized in-process with PyMuPDF; without it, pdf2image
+  is used and requires Poppler installed on the host.
 """
 
+import asyncio
 import os
 import re
 import tempfile
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from itertools import chain
+from typing import Dict, Any, Optional, List, Iterable, Iterator
 
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
-import pytesseract
 from PIL import Image
 from pdf2image import convert_from_path
 
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    import re2 as _regex  # google-re2: linear-time, no backtracking
+except ImportError:
+    _regex = re
+
 from src.config import config
 from src.utils.logger import logger
-from src.utils.cache import cache_get, cache_set
+from src.utils.cache import cache_get, cache_set, stable_hash
 from src.utils.s3_handler import s3_handler  # singleton with upload_file/upload_bytes
-
-# Configure Tesseract path if needed (Windows users often must set this)
-# Example for Windows:
-# pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-# Common Linux/Mac default works if tesseract is on PATH.
+from src.nlp import ocr_worker
+from src.nlp.ocr_worker import MAX_OCR_SIDE, fit_for_ocr, ocr_image as _ocr_image
+
+# Dates and amounts are found in one pass; the date branch comes first so a
+# date like 10/01/2023 is not also split into bogus amounts.
+_FIELD_SCANNER = _regex.compile(
+    r"(?P<date>\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}-\d{2}-\d{2})\b)"
+    r"|(?:\$\s*)?(?P<amt>\d{1,3}(?:,\d{3})*(?:\.\d{2})?)"
+)
+_PROVIDER_PATTERNS = (
+    _regex.compile(r"(?i)(?:provider|bill\s*from|from|to)[:\s]*([A-Z][A-Za-z&.\- ]{2,60})"),
+    _regex.compile(r"(?i)(?:clinic|hospital|medical|services)[:\s]*([A-Z][A-Za-z&.\- ]{2,60})"),
+)
+_DIGIT_RE = _regex.compile(r"\d")
+
+# Fire-and-forget S3 uploads of original invoices (kept off the request thread)
+_S3_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="invoice-s3")
+
+# Upper bound on how long a request waits for an async Textract job
+_TEXTRACT_JOB_TIMEOUT = int(os.getenv("TEXTRACT_JOB_TIMEOUT", "300"))
+
+# Process-wide cap on concurrent Textract calls; throttled calls are retried
+# by botocore's adaptive (client-side rate limiting) retry mode.
+_TX_MAX_INFLIGHT = int(os.getenv("TX_MAX_INFLIGHT", "8"))
+_TX_SEM = threading.BoundedSemaphore(_TX_MAX_INFLIGHT)
+_TEXTRACT_BOTO_CONFIG = BotoConfig(
+    retries={"max_attempts": 6, "mode": "adaptive"},
+    max_pool_connections=max(_TX_MAX_INFLIGHT, 10),
+)
+
+
+def _shrink_image_bytes(data: bytes) -> bytes:
+    """Re-encode an oversized image as JPEG (q=90) at OCR resolution; other input is returned as-is."""
+    try:
+        with Image.open(BytesIO(data)) as img:
+            if max(img.size) <= MAX_OCR_SIDE:
+                return data
+            buf = BytesIO()
+            fit_for_ocr(img.convert("RGB")).save(buf, format="JPEG", quality=90)
+            return buf.getvalue()
+    except Exception as e:
+        logger.debug(f"Image downscale skipped: {e}")
+        return data
+
+
+def _rasterize_pdf(file_path: str, dpi: int = 300) -> List[Image.Image]:
+    """
+    Render PDF pages to images. PyMuPDF renders in-process straight to
+    grayscale (OCR binarizes anyway); pdf2image/Poppler is the fallback.
+    """
+    if fitz is None:
+        # NOTE: Requires Poppler installed for pdf2image to work
+        return convert_from_path(file_path, dpi=dpi)
+
+    images: List[Image.Image] = []
+    with fitz.open(file_path) as doc:
+        for page in doc:
+            pm = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+            images.append(Image.frombytes("L", (pm.width, pm.height), pm.samples, "raw", "L", pm.stride))
+    return images
+
+
+def _line_texts(blocks: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Stream the text of Textract LINE blocks."""
+    for b in blocks:
+        if b["BlockType"] == "LINE":
+            yield b["Text"]
+
+
+# Long-lived OCR worker pool, created on first multi-page scan. "spawn" (not
+# fork) so workers never inherit locks held by other request threads; each
+# worker opens its Tesseract handle once in `init_worker` and reuses it.
+_OCR_WORKERS = config.OCR_WORKERS or min(4, os.cpu_count() or 1)
+_OCR_POOL: Optional[ProcessPoolExecutor] = None
+_OCR_POOL_LOCK = threading.Lock()
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    global _OCR_POOL
+    with _OCR_POOL_LOCK:
+        if _OCR_POOL is None:
+            _OCR_POOL = ProcessPoolExecutor(
+                max_workers=_OCR_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=ocr_worker.init_worker,
+            )
+        return _OCR_POOL
+
+
+def _reset_ocr_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next scan starts a fresh one."""
+    global _OCR_POOL
+    with _OCR_POOL_LOCK:
+        if _OCR_POOL is pool:
+            _OCR_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _ocr_pages(images: List[Image.Image]) -> List[str]:
+    """OCR pages in parallel across worker processes, preserving page order."""
+    if len(images) < 2 or _OCR_WORKERS < 2:
+        return [_ocr_image(img) for img in images]
+
+    pages: List[bytes] = []
+    for img in images:
+        buf = BytesIO()
+        img.save(buf, format="PNG")
+        pages.append(buf.getvalue())
+
+    pool = _get_ocr_pool()
+    try:
+        return list(pool.map(ocr_worker.ocr_page, pages))
+    except BrokenProcessPool as e:
+        logger.warning(f"OCR worker pool broke ({e}) – OCR-ing in process.")
+        _reset_ocr_pool(pool)
+        return [_ocr_image(img) for img in images]
 
 
 class InvoiceProcessor:
@@ -56,7 +185,9 @@ class InvoiceProcessor:
         # Initialize Textract only if AWS creds are present
         if config.AWS_REGION and (os.getenv("AWS_ACCESS_KEY_ID") or os.getenv("AWS_SECRET_ACCESS_KEY")):
             try:
-                self.textract_client = boto3.client("textract", region_name=config.AWS_REGION)
+                self.textract_client = boto3.client(
+                    "textract", region_name=config.AWS_REGION, config=_TEXTRACT_BOTO_CONFIG
+                )
                 logger.info("✅ AWS Textract client initialized.")
             except Exception as e:
                 logger.warning(f"Textract init failed: {e} – falling back to local OCR.")
@@ -69,13 +200,15 @@ class InvoiceProcessor:
         file_bytes: Optional[bytes] = None,
         file_type: str = "pdf",          # "pdf" or "image"
         s3_prefix: str = "invoices",     # S3 folder/prefix
-        s3_filename_hint: Optional[str] = None
+        s3_filename_hint: Optional[str] = None,
+        wait_for_upload: bool = False,   # True → s3_url is in the returned result
     ) -> Dict[str, Any]:
         """
         Main method: Process an invoice via Textract (if available) or local OCR.
         - If `file_bytes` provided and Textract is available → use Textract.
         - Else if `file_path` provided → use local OCR (Tesseract).
-        - Optionally uploads to S3 and returns `s3_url` in the result.
+        - Uploads the original to S3 in the background (cache hits skip it);
+          pass `wait_for_upload=True` to get `s3_url` in the returned result.
         """
         if not file_path and not file_bytes:
             return {"error": "No input file provided", "amount": 0.0, "date": None, "provider": None, "items": []}
@@ -83,7 +216,7 @@ class InvoiceProcessor:
         # Cache key by bytes hash or path mtime + size
         cache_key = None
         if file_bytes:
-            cache_key = f"invoice:bytes:{hash(file_bytes)}"
+            cache_key = f"invoice:bytes:{stable_hash(file_bytes)}"
         elif file_path and os.path.exists(file_path):
             stat = os.stat(file_path)
             cache_key = f"invoice:path:{file_path}:{stat.st_mtime_ns}:{stat.st_size}"
@@ -93,8 +226,21 @@ class InvoiceProcessor:
             logger.debug("🧠 Cache hit for invoice processing")
             return cached
 
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        fname = s3_filename_hint or (os.path.basename(file_path) if file_path else f"invoice_{timestamp}.{file_type}")
+        s3_key = f"{s3_prefix}/{timestamp}_{fname}"
+        s3_url = None
+
         # Process
-        if file_bytes and self.textract_client:
+        if file_bytes and self.textract_client and file_type.lower() == "pdf":
+            # Multi-page PDFs need the async Textract API, which reads from S3,
+            # so upload first and reuse that upload below.
+            s3_url = self._upload_to_s3(s3_key, file_path, file_bytes, file_type)
+            if s3_url:
+                result = self.process_invoice_textract_s3(s3_key)
+            else:
+                result = self.process_invoice_textract(file_bytes, file_type=file_type)
+        elif file_bytes and self.textract_client:
             result = self.process_invoice_textract(file_bytes, file_type=file_type)
         elif file_path:
             result = self.process_invoice_local(file_path)
@@ -108,30 +254,62 @@ class InvoiceProcessor:
             result = {"error": "Unsupported input", "amount": 0.0, "date": None, "provider": None, "items": []}
 
         # Upload to S3 (best-effort)
-        try:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            fname = s3_filename_hint or (os.path.basename(file_path) if file_path else f"invoice_{timestamp}.{file_type}")
-            s3_key = f"{s3_prefix}/{timestamp}_{fname}"
-
-            if file_bytes:
-                ct = "application/pdf" if file_type.lower() == "pdf" else "image/png"
-                s3_url = s3_handler.upload_bytes(file_bytes, s3_key, content_type=ct)
-            else:
-                # file_path path upload
-                ct = "application/pdf" if (file_path or "").lower().endswith(".pdf") else "image/png"
-                s3_url = s3_handler.upload_file(file_path, s3_key, content_type=ct)
-
-            if s3_url:
-                result["s3_url"] = s3_url
-        except Exception as e:
-            logger.warning(f"S3 upload skipped/failed: {e}")
+        if s3_url is None and wait_for_upload:
+            s3_url = self._upload_to_s3(s3_key, file_path, file_bytes, file_type)
+        if s3_url:
+            result["s3_url"] = s3_url
 
         # Cache result
         if cache_key:
             cache_set(cache_key, result, expire_seconds=3600)
 
+        if s3_url is None and not wait_for_upload:
+            _S3_POOL.submit(self._upload_and_annotate, s3_key, file_path, file_bytes, file_type, result, cache_key)
+
         return result
 
+    async def aprocess_invoice(self, **kwargs) -> Dict[str, Any]:
+        """Async wrapper: runs `process_invoice` off the event loop so several invoices can be in flight."""
+        return await asyncio.to_thread(self.process_invoice, **kwargs)
+
+    def _upload_and_annotate(
+        self,
+        s3_key: str,
+        file_path: Optional[str],
+        file_bytes: Optional[bytes],
+        file_type: str,
+        result: Dict[str, Any],
+        cache_key: Optional[str],
+    ) -> None:
+        """Background upload; on success the cached result gains `s3_url`."""
+        s3_url = self._upload_to_s3(s3_key, file_path, file_bytes, file_type)
+        if s3_url and cache_key:
+            cache_set(cache_key, {**result, "s3_url": s3_url}, expire_seconds=3600)
+
+    def _upload_to_s3(
+        self,
+        s3_key: str,
+        file_path: Optional[str],
+        file_bytes: Optional[bytes],
+        file_type: str,
+    ) -> Optional[str]:
+        """Best-effort upload of the original invoice; returns the S3 URL or None."""
+        try:
+            if file_bytes:
+                ct = "application/pdf" if file_type.lower() == "pdf" else "image/png"
+                return s3_handler.upload_bytes(file_bytes, s3_key, content_type=ct)
+            # file_path path upload
+            ct = "application/pdf" if (file_path or "").lower().endswith(".pdf") else "image/png"
+            return s3_handler.upload_file(file_path, s3_key, content_type=ct)
+        except Exception as e:
+            logger.warning(f"S3 upload skipped/failed: {e}")
+            return None
+
+    def _textract(self, operation: str, **kwargs) -> Dict[str, Any]:
+        """Call a Textract operation under the process-wide in-flight limit."""
+        with _TX_SEM:
+            return getattr(self.textract_client, operation)(**kwargs)
+
     # ---------- OCR Implementations ----------
 
     def process_invoice_local(self, file_path: str) -> Dict[str, Any]:
@@ -141,13 +319,11 @@ class InvoiceProcessor:
         try:
             full_text = ""
             if file_path.lower().endswith(".pdf"):
-                # NOTE: Requires Poppler installed for pdf2image to work
-                images: List[Image.Image] = convert_from_path(file_path, dpi=300)
-                for img in images:
-                    full_text += pytesseract.image_to_string(img, lang="eng") + "\n"
+                images = _rasterize_pdf(file_path, dpi=300)
+                full_text = "".join(page + "\n" for page in _ocr_pages(images))
             else:
                 img = Image.open(file_path)
-                full_text = pytesseract.image_to_string(img, lang="eng")
+                full_text = _ocr_image(img)
 
             extracted = self._extract_from_text(full_text)
             logger.debug(f"🧾 Local OCR extracted: amount={extracted.get('amount')} date={extracted.get('date')} provider={extracted.get('provider')}")
@@ -168,19 +344,19 @@ class InvoiceProcessor:
         try:
             if file_type.lower() == "image":
                 # detect_document_text supports images (PNG/JPG)
-                response = self.textract_client.detect_document_text(
-                    Document={"Bytes": file_bytes}
+                response = self._textract(
+                    "detect_document_text",
+                    Document={"Bytes": _shrink_image_bytes(file_bytes)}
                 )
-                lines = [b["Text"] for b in response.get("Blocks", []) if b.get("BlockType") == "LINE"]
-                full_text = " ".join(lines)
+                full_text = " ".join(_line_texts(response.get("Blocks", [])))
             else:
                 # analyze_document supports forms/tables (PDF or images)
-                response = self.textract_client.analyze_document(
+                response = self._textract(
+                    "analyze_document",
                     Document={"Bytes": file_bytes},
                     FeatureTypes=["TABLES", "FORMS"],
                 )
-                lines = [b["Text"] for b in response.get("Blocks", []) if b.get("BlockType") == "LINE"]
-                full_text = " ".join(lines)
+                full_text = " ".join(_line_texts(response.get("Blocks", [])))
 
             extracted = self._extract_from_text(full_text)
             logger.debug(f"🧾 Textract extracted: amount={extracted.get('amount')} date={extracted.get('date')} provider={extracted.get('provider')}")
@@ -193,6 +369,58 @@ class InvoiceProcessor:
             logger.error(f"Unexpected Textract error: {e}")
             return {"error": str(e), "amount": 0.0, "date": None, "provider": None, "items": []}
 
+    def process_invoice_textract_s3(self, s3_key: str) -> Dict[str, Any]:
+        """
+        Multi-page PDFs via async Textract (StartDocumentAnalysis on an S3 object).
+        Polls GetDocumentAnalysis with exponential backoff (1s → 30s cap), then
+        pages through all result blocks.
+        """
+        try:
+            job = self._textract(
+                "start_document_analysis",
+                DocumentLocation={"S3Object": {"Bucket": s3_handler.bucket_name, "Name": s3_key}},
+                FeatureTypes=["TABLES", "FORMS"],
+            )
+            job_id = job["JobId"]
+
+            delay = 1.0
+            deadline = time.monotonic() + _TEXTRACT_JOB_TIMEOUT
+            while True:
+                response = self._textract("get_document_analysis", JobId=job_id)
+                status = response.get("JobStatus")
+                if status != "IN_PROGRESS":
+                    break
+                if time.monotonic() + delay > deadline:
+                    raise TimeoutError(f"Textract job {job_id} still running after {_TEXTRACT_JOB_TIMEOUT}s")
+                time.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+            if status not in ("SUCCEEDED", "PARTIAL_SUCCESS"):
+                raise RuntimeError(f"Textract job {job_id} ended with status {status}: {response.get('StatusMessage')}")
+
+            pages = self._iter_analysis_pages(job_id, response)
+            blocks = chain.from_iterable(page.get("Blocks", []) for page in pages)
+            extracted = self._extract_from_text(" ".join(_line_texts(blocks)))
+            logger.debug(f"🧾 Textract (async) extracted: amount={extracted.get('amount')} date={extracted.get('date')} provider={extracted.get('provider')}")
+            return extracted
+
+        except ClientError as e:
+            logger.error(f"Textract API error: {e}")
+            return {"error": str(e), "amount": 0.0, "date": None, "provider": None, "items": []}
+        except Exception as e:
+            logger.error(f"Unexpected Textract error: {e}")
+            return {"error": str(e), "amount": 0.0, "date": None, "provider": None, "items": []}
+
+    def _iter_analysis_pages(self, job_id: str, first: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield GetDocumentAnalysis result pages, following NextToken lazily."""
+        response = first
+        while True:
+            yield response
+            next_token = response.get("NextToken")
+            if not next_token:
+                return
+            response = self._textract("get_document_analysis", JobId=job_id, NextToken=next_token)
+
     # ---------- Parsing Helpers ----------
 
     def _extract_from_text(self, text: str) -> Dict[str, Any]:
@@ -203,34 +431,36 @@ class InvoiceProcessor:
         - Provider: "Provider: XYZ Clinic", "Bill from: ABC Hospital", "From: ..."
         - Items: lines containing numbers
         """
+        # Amounts + dates in a single scan
+        last_amount = None
+        invoice_date = None
+        for m in _FIELD_SCANNER.finditer(text):
+            date = m.group("date")
+            if date is not None:
+                if invoice_date is None:
+                    invoice_date = date
+            else:
+                last_amount = m.group("amt")
+
         # Amount (prefer the last, assuming it's "Total")
-        amounts = re.findall(r'[\$]?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text)
         total_amount = 0.0
-        if amounts:
+        if last_amount:
             try:
-                total_amount = float(amounts[-1].replace(",", ""))
+                total_amount = float(last_amount.replace(",", ""))
             except Exception:
                 total_amount = 0.0
 
-        # Date
-        dates = re.findall(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}-\d{2}-\d{2})\b', text)
-        invoice_date = dates[0] if dates else None
-
         # Provider (basic heuristics)
         provider = None
-        prov_patterns = [
-            r'(?:provider|bill\s*from|from|to)[:\s]*([A-Z][A-Za-z&.\- ]{2,60})',
-            r'(?:clinic|hospital|medical|services)[:\s]*([A-Z][A-Za-z&.\- ]{2,60})',
-        ]
-        for pat in prov_patterns:
-            m = re.search(pat, text, re.IGNORECASE)
+        for pat in _PROVIDER_PATTERNS:
+            m = pat.search(text)
             if m:
                 provider = m.group(1).strip()
                 break
 
         # Items (simple heuristic: keep lines with numbers)
         lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-        items = [ln for ln in lines if re.search(r'\d', ln)]
+        items = [ln for ln in lines if _DIGIT_RE.search(ln)]
 
         return {
             "amount": total_amount,
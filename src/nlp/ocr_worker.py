@@ -0,0 +1,136 @@
+"""
+OCR Worker
+----------
+Local OCR primitives shared by `invoice_processor` and its OCR worker processes.
+
+Workers are started with the "spawn" method, so this module deliberately
+imports nothing from the app (config, logger, S3, Textract): a worker boots
+with PIL, numpy and Tesseract only, and never inherits parent-process state
+such as held locks or open handles.
+"""
+
+import logging
+import threading
+from io import BytesIO
+from typing import Optional
+
+import numpy as np
+import pytesseract
+from PIL import Image, ImageFilter
+
+try:
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+except ImportError:
+    PyTessBaseAPI = None
+
+# Configure Tesseract path if needed (Windows users often must set this)
+# Example for Windows:
+# pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+# Common Linux/Mac default works if tesseract is on PATH.
+
+# Child of the app logger: in the API process records reach its handlers;
+# in a worker process only warnings surface (via logging's last-resort handler).
+logger = logging.getLogger("fraud_chatbot.ocr")
+
+# =========================================================
+# 🖼️ Preprocessing
+# =========================================================
+_TESSERACT_CONFIG = "--oem 1 --psm 6"
+_MIN_OCR_WIDTH = 1500           # upscale low-res scans below this width
+MAX_OCR_SIDE = 2400             # downscale anything with a longer side than this
+_THRESHOLD_WINDOW = 15          # box-blur radius for the local-mean threshold
+_THRESHOLD_OFFSET = 15
+
+
+def fit_for_ocr(img: Image.Image) -> Image.Image:
+    """
+    Bound OCR input resolution: shrink to a long side of MAX_OCR_SIDE, or
+    upscale low-res scans (up to 2x) without crossing that cap.
+    """
+    w, h = img.size
+    long_side = max(w, h)
+    if long_side > MAX_OCR_SIDE:
+        scale = MAX_OCR_SIDE / long_side
+        return img.resize((int(w * scale), int(h * scale)), Image.LANCZOS)
+    if w < _MIN_OCR_WIDTH:
+        scale = min(2.0, MAX_OCR_SIDE / long_side)
+        if scale > 1.0:
+            return img.resize((int(w * scale), int(h * scale)), Image.BICUBIC)
+    return img
+
+
+def preprocess(img: Image.Image) -> Image.Image:
+    """
+    Grayscale → fit resolution → adaptive mean threshold.
+    Clean binary input lets Tesseract skip most of its own binarization.
+    """
+    gray = fit_for_ocr(img.convert("L"))
+    pixels = np.asarray(gray, dtype=np.int16)
+    local_mean = np.asarray(gray.filter(ImageFilter.BoxBlur(_THRESHOLD_WINDOW)), dtype=np.int16)
+    binary = np.where(pixels > local_mean - _THRESHOLD_OFFSET, 255, 0).astype(np.uint8)
+    return Image.fromarray(binary)
+
+
+# =========================================================
+# 🔤 Tesseract Handle
+# =========================================================
+# One handle per process, opened once and reused (PyTessBaseAPI is not thread-safe).
+# Init is attempted once: after a failure, pytesseract is used for good.
+_TESS_API = None
+_TESS_INIT_ATTEMPTED = False
+_TESS_LOCK = threading.Lock()
+
+
+def _open_tess_api():
+    """Open a tesserocr handle, or None to fall back to pytesseract."""
+    if PyTessBaseAPI is None:
+        return None
+    try:
+        return PyTessBaseAPI(lang="eng", psm=PSM.SINGLE_BLOCK, oem=OEM.LSTM_ONLY)
+    except Exception as e:
+        logger.warning(f"tesserocr init failed: {e} – using pytesseract.")
+        return None
+
+
+def _recognize(api, prepared: Image.Image) -> str:
+    if api is not None:
+        api.SetImage(prepared)
+        return api.GetUTF8Text()
+    return pytesseract.image_to_string(prepared, lang="eng", config=_TESSERACT_CONFIG)
+
+
+def ocr_image(img: Image.Image) -> str:
+    """Preprocess and OCR a single image in the calling (multi-threaded) process."""
+    global _TESS_API, _TESS_INIT_ATTEMPTED
+    prepared = preprocess(img)
+    with _TESS_LOCK:
+        if not _TESS_INIT_ATTEMPTED:
+            _TESS_API = _open_tess_api()
+            _TESS_INIT_ATTEMPTED = True
+        if _TESS_API is not None:
+            return _recognize(_TESS_API, prepared)
+    return _recognize(None, prepared)
+
+
+# =========================================================
+# 👷 Worker-Process Entry Points
+# =========================================================
+# Set by `init_worker`; a worker runs one task at a time, so no lock is needed.
+_WORKER_API: Optional[object] = None
+
+
+def init_worker() -> None:
+    """ProcessPoolExecutor initializer: open this worker's Tesseract handle once."""
+    global _WORKER_API
+    _WORKER_API = _open_tess_api()
+
+
+def ocr_page(png_bytes: bytes) -> str:
+    """OCR one page passed as PNG bytes, using the worker's own handle."""
+    try:
+        with Image.open(BytesIO(png_bytes)) as img:
+            return _recognize(_WORKER_API, preprocess(img))
+    except Exception as e:
+        # Re-raise as a plain RuntimeError: some OCR exceptions (e.g. pytesseract's
+        # TesseractNotFoundError) cannot be unpickled in the parent and would break the pool.
+        raise RuntimeError(f"OCR failed: {type(e).__name__}: {e}") from None
@@ -12,22 +12,55 @@ Detects:
 Technologies:
 - spaCy (NER, pattern matching)
 - SentenceTransformers (semantic similarity)
-- TextBlob (sentiment)
+- VADER (sentiment; TextBlob fallback)
 """
 
+import os
+import queue
 import re
 import threading
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import nullcontext
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
 from unittest.mock import Mock
 
+import numpy as np
 import spacy
 from spacy.matcher import Matcher
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import SentenceTransformer
 from textblob import TextBlob
 
+try:
+    import torch
+except ImportError:
+    torch = None
+
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+except ImportError:
+    SentimentIntensityAnalyzer = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2 as _regex  # google-re2: linear-time, no backtracking
+except ImportError:
+    _regex = re
+
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+except ImportError:
+    ort = None
+
 from src.config import config
 from src.utils.logger import logger
-from src.utils.cache import cache_get, cache_set
+from src.utils.cache import cache_get, cache_set, stable_hash
 from src.fraud_engine.constants import SUSPICIOUS_PHRASES
 
 # =========================================================
@@ -38,10 +71,114 @@ _model = None
 _matcher = None
 _MODEL_LOCK = threading.Lock()
 
+_MONEY_RE = _regex.compile(r"\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?")
+
+# VADER is a plain lexicon lookup (no POS tagging); build it once at import
+_vader = SentimentIntensityAnalyzer() if SentimentIntensityAnalyzer is not None else None
+
+
+# =========================================================
+# 🔎 Suspicious Phrase Automaton
+# =========================================================
+def _build_phrase_automaton():
+    """Compile SUSPICIOUS_PHRASES into one Aho-Corasick automaton (None if unavailable)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for phrase in SUSPICIOUS_PHRASES:
+        automaton.add_word(phrase.lower(), phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+_PHRASE_AUTOMATON = _build_phrase_automaton()
+
+
+def _find_suspicious_phrases(lower_text: str) -> List[str]:
+    """Return SUSPICIOUS_PHRASES found in already-lowercased text, in list order."""
+    if _PHRASE_AUTOMATON is None:
+        return [kw for kw in SUSPICIOUS_PHRASES if kw in lower_text]
+    found = {phrase for _, phrase in _PHRASE_AUTOMATON.iter(lower_text)}
+    return [kw for kw in SUSPICIOUS_PHRASES if kw in found]
+
+
+# =========================================================
+# ⚡ Int8 ONNX Encoder (optional)
+# =========================================================
+class _OnnxEncoder:
+    """
+    Drop-in for the `SentenceTransformer.encode` subset used here, backed by an
+    int8-quantized MiniLM export (see scripts/export_minilm_onnx.py).
+    Mean-pools token embeddings over the attention mask, like the original model.
+    """
+
+    MODEL_FILE = "model_int8.onnx"
+    MAX_LENGTH = 256
+
+    def __init__(self, model_dir: str):
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, self.MODEL_FILE), providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, sentences, batch_size: int = 32, normalize_embeddings: bool = False, **_: Any):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        batches = []
+        for i in range(0, len(texts), batch_size):
+            enc = self.tokenizer(
+                texts[i:i + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.MAX_LENGTH,
+                return_tensors="np",
+            )
+            feeds = {k: v.astype(np.int64) for k, v in enc.items() if k in self._input_names}
+            hidden = self.session.run(None, feeds)[0]
+            mask = enc["attention_mask"][..., None].astype(np.float32)
+            batches.append((hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+
+        embs = np.vstack(batches).astype(np.float32)
+        if normalize_embeddings:
+            embs /= np.clip(np.linalg.norm(embs, axis=1, keepdims=True), 1e-12, None)
+        return embs[0] if single else embs
+
 
 # =========================================================
 # ⚙️ Load NLP Models Lazily (thread-safe)
 # =========================================================
+def _configure_torch_threads() -> None:
+    """
+    Size torch's intra-op pool once (NLP_TORCH_THREADS, default half the CPUs).
+    Set it to 1 when running several API workers to avoid oversubscription.
+    """
+    if torch is None:
+        return
+    threads = getattr(config, "NLP_TORCH_THREADS", 0) or max(1, (os.cpu_count() or 2) // 2)
+    try:
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(min(2, threads))
+    except RuntimeError as e:
+        # Interop pool can only be sized before the first parallel op
+        logger.debug(f"⚠️ torch interop threads already fixed: {e}")
+
+
+def _quantize_int8(model: Any) -> None:
+    """Swap the encoder's Linear layers for dynamic int8 ones (CPU, opt-in)."""
+    if torch is None or not getattr(config, "NLP_QUANTIZE_INT8", False):
+        return
+    try:
+        module = model[0]
+        module.auto_model = torch.quantization.quantize_dynamic(
+            module.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info("✅ SentenceTransformer quantized to dynamic int8.")
+    except Exception as e:
+        logger.warning(f"⚠️ Int8 quantization skipped: {e}")
+
+
 def load_nlp_models() -> None:
     """Load spaCy and SentenceTransformer models only once (lazy-load)."""
     global _nlp, _model, _matcher
@@ -49,7 +186,11 @@ def load_nlp_models() -> None:
         # --- spaCy ---
         if _nlp is None:
             try:
-                _nlp = spacy.load("en_core_web_sm", disable=["parser", "tagger"])
+                # Only NER + Matcher are used; skip the rest of the pipeline
+                _nlp = spacy.load(
+                    "en_core_web_sm",
+                    disable=["parser", "tagger", "lemmatizer", "attribute_ruler"],
+                )
                 logger.info("✅ spaCy model loaded.")
             except Exception as e:
                 logger.warning(f"⚠️ spaCy load failed; using fallback: {e}")
@@ -64,13 +205,29 @@ def load_nlp_models() -> None:
 
                 _nlp = _fallback_nlp
 
-        # --- SentenceTransformer ---
+        # --- SentenceTransformer (int8 ONNX export if configured) ---
+        onnx_dir = getattr(config, "NLP_ONNX_MODEL_DIR", None)
+        if _model is None and onnx_dir and ort is not None:
+            try:
+                _model = _OnnxEncoder(onnx_dir)
+                logger.info(f"✅ Int8 ONNX sentence encoder loaded from {onnx_dir}.")
+            except Exception as e:
+                logger.warning(f"⚠️ ONNX encoder load failed; using SentenceTransformer: {e}")
+
         if _model is None:
+            device = "cuda" if torch is not None and torch.cuda.is_available() else "cpu"
             try:
-                _model = SentenceTransformer("all-MiniLM-L6-v2")
-                logger.info("✅ SentenceTransformer loaded.")
+                _model = SentenceTransformer("all-MiniLM-L6-v2", device=device)
+                logger.info(f"✅ SentenceTransformer loaded on {device}.")
             except Exception as e:
                 logger.warning(f"⚠️ SentenceTransformer load failed: {e}")
+            else:
+                if device == "cuda":
+                    # FP16 weights use tensor cores; cosine scores are unaffected in practice
+                    _model.half()
+                else:
+                    _configure_torch_threads()
+                    _quantize_int8(_model)
 
         # --- Matcher ---
         if _matcher is None:
@@ -93,63 +250,349 @@ def load_nlp_models() -> None:
                 logger.warning(f"⚠️ Matcher initialization failed: {e}")
 
 
+# =========================================================
+# 📦 Encode Micro-Batcher
+# =========================================================
+class _EncodeBatcher:
+    """
+    Coalesces concurrent encode requests into one `model.encode` call.
+    Sync endpoints run on a thread pool, so callers block on a Future while a
+    single worker thread gathers requests for up to `max_wait` seconds (or
+    `max_size` texts) and runs them as one batch. A caller waits at most
+    `timeout` seconds on its batch, then encodes its own texts directly.
+    """
+
+    def __init__(self, max_size: int = 32, max_wait: float = 0.005, timeout: float = 10.0):
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def encode(self, model: Any, texts: List[str]) -> np.ndarray:
+        """Return normalized embeddings for `texts`, batched with other in-flight callers."""
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((model, texts, future))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # A stuck batch must not stall every caller: drop ours if it hasn't started
+            future.cancel()
+            logger.warning(f"⚠️ Encode batch timed out after {self.timeout}s — encoding {len(texts)} text(s) directly")
+            return self._encode_direct(model, texts)
+
+    @staticmethod
+    def _encode_direct(model: Any, texts: List[str]) -> np.ndarray:
+        # Normalized rows make cosine similarity a plain dot product
+        with torch.inference_mode() if torch is not None else nullcontext():
+            return np.asarray(model.encode(
+                texts,
+                batch_size=32,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            ))
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="nlp-encode-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][1])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[1])
+            self._flush(batch)
+
+    @classmethod
+    def _flush(cls, batch: List[Any]) -> None:
+        # Normally one model; group anyway so a fallback instance never mixes in.
+        # Requests whose caller already gave up (cancelled) are skipped.
+        groups: Dict[int, List[Any]] = {}
+        for item in batch:
+            if item[2].set_running_or_notify_cancel():
+                groups.setdefault(id(item[0]), []).append(item)
+
+        for items in groups.values():
+            model = items[0][0]
+            texts = [t for _, item_texts, _ in items for t in item_texts]
+            try:
+                embs = cls._encode_direct(model, texts)
+            except Exception as e:
+                for _, _, future in items:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for _, item_texts, future in items:
+                future.set_result(embs[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+
+_encode_batcher = _EncodeBatcher(
+    max_wait=getattr(config, "NLP_BATCH_MAX_WAIT_MS", 5) / 1000.0,
+    timeout=getattr(config, "NLP_BATCH_TIMEOUT", 10),
+)
+
+
+# =========================================================
+# 💾 Embedding Cache
+# =========================================================
+class _EmbeddingStore:
+    """
+    In-process corpus of normalized embeddings kept as one contiguous float16
+    (rows, dim) matrix, with a key → row index. Capacity grows by doubling;
+    once `max_rows` is reached the store starts over rather than growing.
+    """
+
+    def __init__(self, max_rows: int = 50_000, initial_rows: int = 256):
+        self.max_rows = max_rows
+        self._initial_rows = initial_rows
+        self._matrix: Optional[np.ndarray] = None
+        self._index: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Return float32 rows for known keys (None for unknown), gathered in one pass."""
+        with self._lock:
+            positions = [self._index.get(k) for k in keys]
+            hits = [p for p in positions if p is not None]
+            if not hits:
+                return [None] * len(keys)
+            # numpy has no fp16 BLAS path, so upcast once for the matmul
+            block = iter(self._matrix[hits].astype(np.float32))
+            return [next(block) if p is not None else None for p in positions]
+
+    def add(self, keys: List[str], vectors: np.ndarray) -> None:
+        """Append rows (stored as float16)."""
+        vectors = np.asarray(vectors, dtype=np.float16)
+        with self._lock:
+            n = self._size
+            if n + len(keys) > self.max_rows:
+                self._matrix, self._index, n = None, {}, 0
+            if self._matrix is None:
+                self._matrix = np.empty((max(self._initial_rows, len(keys)), vectors.shape[1]), dtype=np.float16)
+            elif n + len(keys) > len(self._matrix):
+                grown = np.empty((max(len(self._matrix) * 2, n + len(keys)), self._matrix.shape[1]), dtype=np.float16)
+                grown[:n] = self._matrix[:n]
+                self._matrix = grown
+            self._matrix[n:n + len(keys)] = vectors
+            self._index.update(zip(keys, range(n, n + len(keys))))
+            self._size = n + len(keys)
+
+
+# The only embedding cache: keeping vectors out of the shared `cache_set` LRU
+# avoids a second copy and leaves its entry cap to result caching.
+_embedding_store = _EmbeddingStore(
+    max_rows=getattr(config, "NLP_EMBEDDING_STORE_MAX", 50_000),
+)
+
+
+def _encode_cached(model: Any, texts: List[str], digests: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Return normalized embeddings for `texts` as a float32 (n, dim) matrix.
+    Rows come from the in-process float16 store; only the misses go through
+    the model, in one batched forward pass. Pass `digests` when the caller
+    already hashed the texts.
+    """
+    keys = digests or [stable_hash(t) for t in texts]
+    found = _embedding_store.get(keys)
+    missing = [i for i, vec in enumerate(found) if vec is None]
+
+    if missing:
+        fresh = _encode_batcher.encode(model, [texts[i] for i in missing]).astype(np.float16)
+        _embedding_store.add([keys[i] for i in missing], fresh)
+        # Round-trip through float16 so hits and misses return identical values
+        for i, vec in zip(missing, fresh.astype(np.float32)):
+            found[i] = vec
+
+    return np.stack(found)
+
+
 # =========================================================
 # 🧠 Analyze Text for Fraud Indicators
 # =========================================================
-def analyze_text(text: str, past_texts: Optional[List[str]] = None) -> Dict[str, Any]:
-    """Analyze claim notes for suspicious content, entities, similarity, and sentiment."""
+def _empty_result() -> Dict[str, Any]:
+    return {
+        "suspicious_phrases": [],
+        "entities": {},
+        "keyword_count": 0,
+        "similarity_scores": [],
+        "max_similarity": 0.0,
+        "sentiment": 0.0,
+        "is_suspicious": False,
+        "text_length": 0,
+    }
+
+
+class _LocalDoc:
+    """Minimal stand-in when spaCy fails on a text."""
+
+    def __init__(self, t: str):
+        self.text = t
+        self.ents: List[Any] = []
+
+
+def _make_doc(text: str):
+    """Run spaCy on one text (fallback-safe). Pass original casing — NER relies on it."""
+    try:
+        return _nlp(text)
+    except Exception:
+        return _LocalDoc(text)
+
+
+def analyze_text(
+    text: str, past_texts: Optional[List[str]] = None, minimal: bool = False
+) -> Dict[str, Any]:
+    """
+    Analyze claim notes for suspicious content, entities, similarity, and sentiment.
+    With `minimal=True`, a text that already has suspicious keywords returns
+    right after extraction (no similarity/sentiment) — for callers that only
+    need the keyword verdict.
+    """
     if not text or not text.strip():
-        return {
-            "suspicious_phrases": [],
-            "entities": {},
-            "keyword_count": 0,
-            "similarity_scores": [],
-            "max_similarity": 0.0,
-            "sentiment": 0.0,
-            "is_suspicious": False,
-            "text_length": 0,
-        }
+        return _empty_result()
 
     load_nlp_models()
-    global _nlp, _model, _matcher
 
     # --- Cache ---
-    cache_key = f"nlp:{hash(text)}"
-    cached = cache_get(cache_key)
+    digest = stable_hash(text)
+    result_key = _result_key(digest, past_texts)
+    cached = cache_get(result_key)
     if cached:
         return cached
 
-    # --- spaCy doc (fallback-safe) ---
-    try:
-        doc = _nlp(text.lower())
-    except Exception:
-        class _LocalDoc:
-            def __init__(self, t: str):
-                self.text = t
-                self.ents: List[Any] = []
+    extracted = _extraction_lru.get(digest)
+    if extracted is None:
+        extracted = _extract(text.lower(), _make_doc(text))
+        _extraction_lru.put(digest, extracted, len(text))
+    return _analyze_extracted(text, extracted, past_texts, digest, result_key, minimal)
+
+
+def _result_key(digest: str, past_texts: Optional[List[str]]) -> str:
+    """Result cache key: similarity depends on `past_texts`, so they are part of the key."""
+    if not past_texts:
+        return f"nlp:{digest}"
+    return f"nlp:{digest}:{stable_hash(chr(0).join(past_texts))}"
 
-        doc = _LocalDoc(text.lower())
 
-    # --- Suspicious keyword detection ---
-    suspicious_phrases = [kw for kw in SUSPICIOUS_PHRASES if kw in text.lower()]
+def analyze_texts(
+    texts: List[str], past_texts: Optional[List[str]] = None, minimal: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Batched `analyze_text`: uncached texts go through spaCy together via
+    `nlp.pipe` (mini-batched) instead of one `nlp()` call each.
+    Results are returned in input order.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+    pending = []  # (index, text, digest, result_key, extracted)
+
+    load_nlp_models()
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            results[i] = _empty_result()
+            continue
+        digest = stable_hash(text)
+        result_key = _result_key(digest, past_texts)
+        cached = cache_get(result_key)
+        if cached:
+            results[i] = cached
+            continue
+        pending.append([i, text, digest, result_key, _extraction_lru.get(digest)])
+
+    # Only texts the extraction LRU has not seen go through spaCy
+    to_parse = [item for item in pending if item[4] is None]
+    if to_parse:
+        raw = [item[1] for item in to_parse]
+        try:
+            docs = list(_nlp.pipe(raw, batch_size=64))
+        except Exception:
+            docs = [_make_doc(text) for text in raw]
+        for item, doc in zip(to_parse, docs):
+            item[4] = _extract(item[1].lower(), doc)
+            _extraction_lru.put(item[2], item[4], len(item[1]))
+
+    for i, text, digest, result_key, extracted in pending:
+        results[i] = _analyze_extracted(text, extracted, past_texts, digest, result_key, minimal)
+
+    return results
+
+
+# =========================================================
+# 🗂️ Extraction LRU (phrases + spaCy entities per text)
+# =========================================================
+class _ExtractionLRU:
+    """
+    Bounded LRU of `(suspicious_phrases, entities)` keyed by the text
+    digest. Repeated narratives skip the spaCy pipeline entirely; only the
+    small extracted values are kept, never the Doc. Texts longer than
+    `max_chars` are not cached, which bounds per-entry memory.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_chars: int = 4096):
+        self.maxsize = maxsize
+        self.max_chars = max_chars
+        self._data: "OrderedDict[str, Tuple[List[str], Dict[str, List[str]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[List[str], Dict[str, List[str]]]]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Tuple[List[str], Dict[str, List[str]]], text_len: int = 0) -> None:
+        if text_len > self.max_chars:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_extraction_lru = _ExtractionLRU()
+
+
+def _extract(lower_text: str, doc: Any) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Suspicious phrases (automaton + matcher) and spaCy entities for one text."""
+    # --- Suspicious keyword detection (single pass) ---
+    suspicious_phrases = _find_suspicious_phrases(lower_text)
     if _matcher:
+        seen = set(suspicious_phrases)
         try:
             for _, start, end in _matcher(doc):
                 try:
-                    phrase = doc[start:end].text
-                    if phrase not in suspicious_phrases:
+                    phrase = doc[start:end].text.lower()
+                    if phrase not in seen:
+                        seen.add(phrase)
                         suspicious_phrases.append(phrase)
                 except Exception:
                     continue
         except Exception as e:
             logger.debug(f"⚠️ Matcher execution skipped: {e}")
 
-    keyword_count = len(suspicious_phrases)
-
     # =========================================================
     # 🧩 Entity Extraction (Mock + spaCy Compatible)
     # =========================================================
-    entities: Dict[str, List[str]] = {}
+    entities: Dict[str, List[str]] = defaultdict(list)
     try:
         ents = getattr(doc, "ents", [])
 
@@ -167,31 +610,59 @@ def analyze_text(text: str, past_texts: Optional[List[str]] = None) -> Dict[str,
             label = getattr(ent, "label_", None)
             text_val = getattr(ent, "text", None)
             if label and text_val:
-                entities.setdefault(str(label), []).append(str(text_val))
+                entities[str(label)].append(str(text_val))
     except Exception as e:
         logger.debug(f"⚠️ Entity extraction failed: {e}")
 
+    return suspicious_phrases, dict(entities)
+
+
+def _analyze_extracted(
+    text: str,
+    extracted: Tuple[List[str], Dict[str, List[str]]],
+    past_texts: Optional[List[str]],
+    digest: str,
+    result_key: str,
+    minimal: bool = False,
+) -> Dict[str, Any]:
+    """Score one text from its extracted phrases/entities, and cache the result."""
+    # Copy: the LRU entry is shared and MONEY is appended below
+    suspicious_phrases = list(extracted[0])
+    entities = defaultdict(list, {label: list(values) for label, values in extracted[1].items()})
+    keyword_count = len(suspicious_phrases)
+
     # --- MONEY extraction ---
-    money_matches = re.findall(r"\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?", text)
+    money_matches = _MONEY_RE.findall(text)
     valid_money = [m for m in money_matches if "$" in m or "," in m or "." in m]
     if valid_money:
-        entities.setdefault("MONEY", []).extend(valid_money)
+        entities["MONEY"].extend(valid_money)
+
+    # --- Short-circuit: keywords alone already make it suspicious ---
+    # Not cached: the full-result key must never hold this partial result.
+    if minimal and keyword_count > 0:
+        result = _empty_result()
+        result.update(
+            suspicious_phrases=suspicious_phrases,
+            entities=dict(entities),
+            keyword_count=keyword_count,
+            is_suspicious=True,
+            text_length=len(text),
+        )
+        return result
 
     # =========================================================
     # 🔁 Similarity
     # =========================================================
     similarity_scores: List[float] = []
     max_similarity = 0.0
-    if past_texts:
+    corpus = [prev for prev in (past_texts or []) if prev and prev.strip()]
+    if corpus:
         try:
             model = _model or SentenceTransformer("all-MiniLM-L6-v2")
-            q_emb = model.encode(text)
-            for prev in past_texts:
-                if not prev.strip():
-                    continue
-                p_emb = model.encode(prev)
-                sim = util.cos_sim(q_emb, p_emb)[0][0].item()
-                similarity_scores.append(round(sim, 3))
+            digests = [digest, *(stable_hash(prev) for prev in corpus)]
+            embs = _encode_cached(model, [text, *corpus], digests)
+            sims = embs[1:] @ embs[0]
+            similarity_scores = [round(float(sim), 3) for sim in sims]
             max_similarity = max(similarity_scores) if similarity_scores else 0.0
         except Exception as e:
             logger.debug(f"⚠️ Similarity computation failed: {e}")
@@ -200,7 +671,10 @@ def analyze_text(text: str, past_texts: Optional[List[str]] = None) -> Dict[str,
     # ❤️ Sentiment Analysis
     # =========================================================
     try:
-        sentiment = TextBlob(text).sentiment.polarity
+        if _vader is not None:
+            sentiment = _vader.polarity_scores(text)["compound"]
+        else:
+            sentiment = TextBlob(text).sentiment.polarity
     except Exception as e:
         logger.debug(f"⚠️ Sentiment analysis failed: {e}")
         sentiment = 0.0
@@ -216,7 +690,7 @@ def analyze_text(text: str, past_texts: Optional[List[str]] = None) -> Dict[str,
 
     result = {
         "suspicious_phrases": suspicious_phrases,
-        "entities": entities,
+        "entities": dict(entities),
         "keyword_count": keyword_count,
         "similarity_scores": similarity_scores,
         "max_similarity": max_similarity,
@@ -225,7 +699,7 @@ def analyze_text(text: str, past_texts: Optional[List[str]] = None) -> Dict[str,
         "text_length": len(text),
     }
 
-    cache_set(cache_key, result, expire_seconds=1800)
+    cache_set(result_key, result, expire_seconds=1800)
     logger.debug(
         f"🧩 NLP Analysis: {keyword_count} keywords, sim={max_similarity:.2f}, sent={sentiment:.2f}"
     )
@@ -235,18 +709,33 @@ def analyze_text(text: str, past_texts: Optional[List[str]] = None) -> Dict[str,
 # =========================================================
 # 🧮 Text Similarity Utility
 # =========================================================
-def get_text_similarity(text1: str, text2: str) -> float:
-    """Return cosine similarity between two texts."""
+def get_text_similarities(text: str, others: List[str]) -> List[float]:
+    """
+    Cosine similarity of `text` against each of `others` (0.0 for blanks).
+    One cached, batched encode and a single dot product against the
+    normalized rows — no per-pair torch tensors.
+    """
+    if not text or not text.strip() or not others:
+        return [0.0] * len(others)
+
     load_nlp_models()
-    global _model
     try:
         model = _model or SentenceTransformer("all-MiniLM-L6-v2")
-        emb1 = model.encode(text1)
-        emb2 = model.encode(text2)
-        return float(util.cos_sim(emb1, emb2)[0][0])
+        keep = [i for i, other in enumerate(others) if other and other.strip()]
+        sims = [0.0] * len(others)
+        if keep:
+            embs = _encode_cached(model, [text, *(others[i] for i in keep)])
+            for i, sim in zip(keep, embs[1:] @ embs[0]):
+                sims[i] = float(sim)
+        return sims
     except Exception as e:
         logger.debug(f"⚠️ Text similarity computation error: {e}")
-        return 0.0
+        return [0.0] * len(others)
+
+
+def get_text_similarity(text1: str, text2: str) -> float:
+    """Return cosine similarity between two texts."""
+    return get_text_similarities(text1, [text2])[0]
 
 
 # =========================================================
@@ -0,0 +1,84 @@
+"""
+Authentication Middleware
+-------------------------
+Pure ASGI bearer-token authentication for protected paths (and their sub-paths).
+
+Features:
+- Reads `authorization` straight from `scope["headers"]` (no Headers/dict build).
+- Verifies the JWT via `src.utils.security.verify_jwt_token_cached`.
+- Attaches the user to `scope["state"]`, readable as `request.state.user`.
+- Mirrors `get_current_user`: DEBUG mode authenticates as the dev user.
+
+Usage:
+    from src.utils.auth_middleware import AuthMiddleware
+    app.add_middleware(AuthMiddleware, protected_paths=("/me",))
+"""
+
+import orjson
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Any, Dict, Iterable, Optional
+from src.config import config
+from src.utils.logger import logger
+from src.utils.security import verify_jwt_token_cached
+
+DEV_USER = {"user_id": "dev_user", "role": "admin"}
+
+_UNAUTHORIZED_BODY = orjson.dumps({"detail": "Missing or invalid authentication token"})
+_UNAUTHORIZED_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_UNAUTHORIZED_BODY)).encode()),
+    (b"www-authenticate", b"Bearer"),
+]
+
+
+class AuthMiddleware:
+    """
+    Authenticates requests for one of `protected_paths` or anything beneath it
+    (matched per path segment: "/me" covers "/me/x" but not "/metrics").
+    All other requests pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, protected_paths: Iterable[str] = ("/me",)):
+        self.app = app
+        self.protected_paths = tuple(p.rstrip("/") for p in protected_paths)
+        self._subtree_prefixes = tuple(p + "/" for p in self.protected_paths)
+
+    def _is_protected(self, path: str) -> bool:
+        return path in self.protected_paths or path.startswith(self._subtree_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._is_protected(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        user = self._authenticate(scope["headers"])
+        if user is None:
+            await send({"type": "http.response.start", "status": 401, "headers": _UNAUTHORIZED_HEADERS})
+            await send({"type": "http.response.body", "body": _UNAUTHORIZED_BODY})
+            return
+
+        scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _authenticate(headers) -> Optional[Dict[str, Any]]:
+        """Return the user for a valid bearer token, or None."""
+        if config.DEBUG:
+            return dict(DEV_USER)
+
+        for name, value in headers:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer" or not token:
+                    return None
+                try:
+                    payload = verify_jwt_token_cached(token.strip())
+                except HTTPException:
+                    return None
+                if not payload:
+                    return None
+                return {"user_id": payload.get("sub"), "role": payload.get("role", "user")}
+
+        logger.debug("🔒 Missing Authorization header on protected path")
+        return None
@@ -5,10 +5,14 @@ Handles Redis + in-memory fallback for caching fraud scores, NLP results, and ex
 Optimized for FastAPI async workloads and safe in local/AWS setups.
 """
 
-import json
+import hashlib
 import threading
-from typing import Optional, Any, Dict
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Optional, Any, Dict, Union
+from datetime import datetime
+import orjson
 from src.config import config
 from src.utils.logger import logger
 
@@ -20,20 +24,85 @@ except ImportError:
 # =========================================================
 # 🧠 In-memory fallback
 # =========================================================
-_cache_store: Dict[str, Any] = {}
+# Values and expiries live in parallel dicts (no per-entry tuple); expiries are
+# `time.monotonic()` deadlines, so a hit is one float compare.
+# `_cache_values` doubles as the LRU order; the store is capped at CACHE_MAX_ENTRIES.
+CACHE_MAX_ENTRIES = getattr(config, "CACHE_MAX_ENTRIES", 10_000)
+_cache_values: "OrderedDict[str, Any]" = OrderedDict()
+_cache_expiries: Dict[str, float] = {}
 _cache_lock = threading.Lock()
 
 
+def _local_get(key: str) -> Optional[Any]:
+    """Return a live local entry, dropping it if expired. Caller holds `_cache_lock`."""
+    expiry = _cache_expiries.get(key)
+    if expiry is None:
+        return None
+    if expiry > time.monotonic():
+        logger.debug(f"⚡ Cache hit (Local): {key}")
+        _cache_values.move_to_end(key)
+        return _cache_values[key]
+    del _cache_values[key], _cache_expiries[key]
+    logger.debug(f"🕒 Cache expired (Local): {key}")
+    return None
+
+
+def _local_set(key: str, value: Any, expire_seconds: int) -> None:
+    """Store a local entry with a TTL, evicting the LRU entry past the cap. Caller holds `_cache_lock`."""
+    _cache_values[key] = value
+    _cache_values.move_to_end(key)
+    _cache_expiries[key] = time.monotonic() + expire_seconds
+    if len(_cache_values) > CACHE_MAX_ENTRIES:
+        oldest, _ = _cache_values.popitem(last=False)
+        _cache_expiries.pop(oldest, None)
+
+
+def _local_delete(key: str) -> None:
+    """Drop a local entry if present. Caller holds `_cache_lock`."""
+    _cache_values.pop(key, None)
+    _cache_expiries.pop(key, None)
+
+
+def _local_clear(prefix: str) -> None:
+    """Drop every local entry whose key starts with `prefix`. Caller holds `_cache_lock`."""
+    for k in [k for k in _cache_values if k.startswith(prefix)]:
+        _local_delete(k)
+
+
 # =========================================================
 # 🧰 JSON Safe Serialization
 # =========================================================
+def _json_default(o: Any) -> str:
+    if isinstance(o, datetime):
+        return o.isoformat()
+    return str(o)
+
+
+# orjson handles datetime/numpy natively; `_json_default` covers everything else
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _json_dumps_bytes(data: Any) -> bytes:
+    return orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS)
+
+
 def safe_json_dumps(data: Any) -> str:
     """Safely convert data to JSON (handles datetime)."""
-    def default(o):
-        if isinstance(o, datetime):
-            return o.isoformat()
-        return str(o)
-    return json.dumps(data, default=default)
+    return _json_dumps_bytes(data).decode()
+
+
+# =========================================================
+# 🔑 Stable Cache Keys
+# =========================================================
+def stable_hash(data: Union[str, bytes]) -> str:
+    """
+    Deterministic 128-bit BLAKE2b hex digest for cache keys.
+    Unlike built-in `hash()`, it is not salted per process, so keys match
+    across workers and restarts (and in Redis).
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 # =========================================================
@@ -42,24 +111,14 @@ def safe_json_dumps(data: Any) -> str:
 def cache_get(key: str) -> Optional[Any]:
     """Get cached value by key from local in-memory store."""
     with _cache_lock:
-        entry = _cache_store.get(key)
-        if entry:
-            value, expire_time = entry
-            if datetime.now() < expire_time:
-                logger.debug(f"⚡ Cache hit (Local): {key}")
-                return value
-            else:
-                del _cache_store[key]
-                logger.debug(f"🕒 Cache expired (Local): {key}")
-    return None
+        return _local_get(key)
 
 
 def cache_set(key: str, value: Any, expire_seconds: int = 3600) -> bool:
     """Set cache value with TTL (in seconds) in the local in-memory store."""
     try:
         with _cache_lock:
-            expire_time = datetime.now() + timedelta(seconds=expire_seconds)
-            _cache_store[key] = (value, expire_time)
+            _local_set(key, value, expire_seconds)
             logger.debug(f"💾 Cache set (Local): {key} ({expire_seconds}s)")
         return True
     except Exception as e:
@@ -71,7 +130,7 @@ def cache_delete(key: str) -> None:
     """Delete a single cache key from the local store."""
     try:
         with _cache_lock:
-            _cache_store.pop(key, None)
+            _local_delete(key)
         logger.debug(f"🗑️ Cache deleted: {key}")
     except Exception as e:
         logger.warning(f"Cache delete error for {key}: {e}")
@@ -81,14 +140,61 @@ def clear_cache(prefix: str = "") -> None:
     """Clear all cache keys matching a prefix from local store."""
     try:
         with _cache_lock:
-            for k in list(_cache_store.keys()):
-                if k.startswith(prefix):
-                    del _cache_store[k]
+            _local_clear(prefix)
         logger.info(f"🧹 Cleared cache for prefix '{prefix}'")
     except Exception as e:
         logger.error(f"Cache clear error for {prefix}: {e}")
 
 
+def sweep_expired() -> int:
+    """Drop every expired local entry (run periodically); returns how many were removed."""
+    now = time.monotonic()
+    with _cache_lock:
+        expired = [k for k, expiry in _cache_expiries.items() if expiry <= now]
+        for k in expired:
+            _local_delete(k)
+    if expired:
+        logger.debug(f"🧹 Swept {len(expired)} expired cache entries")
+    return len(expired)
+
+
+# =========================================================
+# 🛫 Single-Flight (coalesce concurrent misses per key)
+# =========================================================
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one execution: the first
+    caller runs `fn`, the rest block on its Future and get the same result
+    (or exception). Keeps a hot cache miss from fanning out into N identical
+    upstream requests. Thread-based, for the sync worker-thread paths.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
 # =========================================================
 # 🧩 RedisCache class (exported for tests)
 # =========================================================
@@ -97,70 +203,80 @@ class RedisCache:
 
     def __init__(self, url: Optional[str] = None):
         self.url = url or getattr(config, "REDIS_URL", "redis://localhost:6379/0")
-        self._local_cache = _cache_store
         self._lock = _cache_lock
         self.client = None
         self.use_redis = False
 
         if redis is None:
             logger.warning("⚠️ redis package not installed — using local in-memory cache.")
-            return
+        else:
+            try:
+                self.client = redis.from_url(self.url, decode_responses=True, socket_timeout=3)
+                self.client.ping()
+                self.use_redis = True
+                logger.info(f"✅ Connected to Redis at {self.url}")
+            except Exception as e:
+                self.client = None
+                self.use_redis = False
+                logger.warning(f"⚠️ Redis unavailable ({e}). Using local in-memory cache instead.")
 
-        try:
-            self.client = redis.from_url(self.url, decode_responses=True, socket_timeout=3)
-            self.client.ping()
-            self.use_redis = True
-            logger.info(f"✅ Connected to Redis at {self.url}")
-        except Exception as e:
-            self.client = None
-            self.use_redis = False
-            logger.warning(f"⚠️ Redis unavailable ({e}). Using local in-memory cache instead.")
+        self._bind_backend()
+
+    def _bind_backend(self) -> None:
+        """Pick the backend once, so get/set/delete skip the per-call branch."""
+        if self.use_redis and self.client:
+            self._get_impl, self._set_impl, self._del_impl = self._redis_get, self._redis_set, self._redis_delete
+        else:
+            self._get_impl, self._set_impl, self._del_impl = self._memory_get, self._memory_set, self._memory_delete
 
     def get_client(self):
         return self.client
 
-    def set(self, key: str, value: Any, expire: int = 3600):
+    # Backend implementations, bound in `_bind_backend`.
+    def _redis_set(self, key: str, value: Any, expire: int) -> None:
+        # Bytes go to Redis as-is; no str round-trip
+        self.client.setex(key, expire, _json_dumps_bytes(value))
+        logger.debug("💾 Cache set (Redis): %s (%ss)", key, expire)
+
+    def _redis_get(self, key: str) -> Optional[Any]:
+        value = self.client.get(key)
+        return orjson.loads(value) if value else None
+
+    def _redis_delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def _memory_set(self, key: str, value: Any, expire: int) -> None:
+        with self._lock:
+            _local_set(key, value, expire)
+        logger.debug("💾 Cache set (Local): %s (%ss)", key, expire)
+
+    def _memory_get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return _local_get(key)
+
+    def _memory_delete(self, key: str) -> None:
+        with self._lock:
+            _local_delete(key)
+
+    # Public get/set/delete are real methods (patchable at class level); they
+    # delegate to the bound backend and log, rather than raise, cache errors.
+    def set(self, key: str, value: Any, expire: int = 3600) -> None:
         try:
-            if self.use_redis and self.client:
-                self.client.setex(key, expire, safe_json_dumps(value))
-                logger.debug(f"💾 Cache set (Redis): {key} ({expire}s)")
-            else:
-                with self._lock:
-                    expire_time = datetime.now() + timedelta(seconds=expire)
-                    self._local_cache[key] = (value, expire_time)
-                    logger.debug(f"💾 Cache set (Local): {key} ({expire}s)")
+            self._set_impl(key, value, expire)
         except Exception as e:
             logger.warning(f"Cache set error for {key}: {e}")
 
     def get(self, key: str) -> Optional[Any]:
         try:
-            if self.use_redis and self.client:
-                value = self.client.get(key)
-                return json.loads(value) if value else None
-
-            with self._lock:
-                entry = self._local_cache.get(key)
-                if entry:
-                    value, expire_time = entry
-                    if datetime.now() < expire_time:
-                        logger.debug(f"⚡ Cache hit (Local): {key}")
-                        return value
-                    else:
-                        del self._local_cache[key]
-                        logger.debug(f"🕒 Cache expired (Local): {key}")
-            return None
+            return self._get_impl(key)
         except Exception as e:
             logger.debug(f"Cache get failed for {key}: {e}")
             return None
 
     def delete(self, key: str) -> None:
         try:
-            if self.use_redis and self.client:
-                self.client.delete(key)
-            else:
-                with self._lock:
-                    self._local_cache.pop(key, None)
-            logger.debug(f"🗑️ Cache deleted: {key}")
+            self._del_impl(key)
+            logger.debug("🗑️ Cache deleted: %s", key)
         except Exception as e:
             logger.warning(f"Cache delete error for {key}: {e}")
 
@@ -176,9 +292,7 @@ class RedisCache:
                         break
             else:
                 with self._lock:
-                    for k in list(self._local_cache.keys()):
-                        if k.startswith(prefix):
-                            del self._local_cache[k]
+                    _local_clear(prefix)
             logger.info(f"🧹 Cleared cache for prefix '{prefix}'")
         except Exception as e:
             logger.error(f"Cache clear error for {prefix}: {e}")
@@ -190,4 +304,7 @@ __all__ = [
     "cache_set",
     "cache_delete",
     "clear_cache",
+    "sweep_expired",
+    "SingleFlight",
+    "stable_hash",
 ]
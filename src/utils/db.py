@@ -5,14 +5,22 @@ Manages Postgres (or SQLite fallback) connection, table creation, seeding,
 and helper functions for claims, blacklist, and policy guidance.
 """
 
-from sqlalchemy import create_engine, text
+import select
+import threading
+import time
+import orjson
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, Float, Integer, MetaData, Numeric, String, Table, Text,
+    create_engine, insert, text,
+)
+from sqlalchemy.pool import NullPool, SingletonThreadPool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import FrozenSet, Iterable, List, NamedTuple, Optional, Dict, Any, Tuple
 from src.config import config
 from src.utils.logger import logger
-from src.models.fraud import Decision
+from src.models.fraud import Decision, FRAUD_ALARMS_ADAPTER
 from src.models.policy import PolicyGuidance
 from src.models.claim import ClaimData
 
@@ -21,14 +29,43 @@ from src.models.claim import ClaimData
 # =========================================================
 Base = declarative_base()
 
+_IS_SQLITE = config.DB_URL.startswith("sqlite")
+
+if _IS_SQLITE:
+    # Dev fallback: one connection per thread, kept open — no per-request file open.
+    # sqlite3 takes `timeout` (lock wait), not `connect_timeout`.
+    _POOL_KWARGS: Dict[str, Any] = {
+        "poolclass": SingletonThreadPool,
+        "pool_size": config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW,  # threads kept, matches db_limiter
+        "connect_args": {"timeout": 10},
+    }
+    _HEALTH_POOL_KWARGS: Dict[str, Any] = _POOL_KWARGS
+else:
+    _POOL_KWARGS = {
+        "pool_pre_ping": True,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_recycle": config.DB_POOL_RECYCLE,  # retire connections before server/LB idle cutoffs
+        "pool_timeout": config.DB_POOL_TIMEOUT,  # fail fast instead of queueing 30s on a drained pool
+        "connect_args": {"connect_timeout": 10},
+    }
+    _HEALTH_POOL_KWARGS = {
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": 2,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "connect_args": {"connect_timeout": 5},
+    }
+
+
+def _json_serializer(obj: Any) -> str:
+    """JSON/JSONB bind serializer: orjson instead of SQLAlchemy's stdlib json default."""
+    return orjson.dumps(obj, default=str).decode()
+
+
 try:
     engine = create_engine(
-        config.DB_URL,
-        echo=config.DEBUG,
-        pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10,
-        connect_args={"connect_timeout": 10},
+        config.DB_URL, echo=config.DEBUG, json_serializer=_json_serializer, **_POOL_KWARGS
     )
     logger.info(f"✅ Database engine initialized: {config.DB_URL}")
 except Exception as e:
@@ -37,6 +74,11 @@ except Exception as e:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Tiny dedicated pool for health probes: a saturated main pool must not make
+# /health report a false negative (and probes must not steal request slots).
+health_engine = create_engine(config.DB_URL, **_HEALTH_POOL_KWARGS)
+
+
 def get_db() -> Session:
     """FastAPI dependency for DB session."""
     db = SessionLocal()
@@ -46,6 +88,17 @@ def get_db() -> Session:
         db.close()
 
 
+def ping_db() -> bool:
+    """Run `SELECT 1` on the health-probe pool; True if the database answers."""
+    try:
+        with health_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ DB health probe failed: {e}")
+        return False
+
+
 # =========================================================
 # 🧱 Table Initialization
 # =========================================================
@@ -77,6 +130,12 @@ def init_db() -> None:
                 );
             """))
 
+            # Serves get_claimant_history: equality on claimant_id + range on created_at
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_claims_claimant_created
+                ON claims (claimant_id, created_at DESC);
+            """))
+
             conn.execute(text("""
                 CREATE TABLE IF NOT EXISTS blacklist (
                     provider VARCHAR(255) PRIMARY KEY,
@@ -96,6 +155,39 @@ def init_db() -> None:
                 );
             """))
 
+            # Statement-level NOTIFY so every writer (app, seed script, psql) invalidates
+            # the in-process blacklist snapshot via `start_blacklist_listener`.
+            try:
+                with conn.begin_nested():
+                    conn.execute(text("""
+                        CREATE OR REPLACE FUNCTION notify_blacklist_changed() RETURNS trigger AS $$
+                        BEGIN
+                            PERFORM pg_notify('blacklist_changed', '');
+                            RETURN NULL;
+                        END;
+                        $$ LANGUAGE plpgsql;
+                    """))
+                    conn.execute(text("DROP TRIGGER IF EXISTS blacklist_changed ON blacklist;"))
+                    conn.execute(text("""
+                        CREATE TRIGGER blacklist_changed
+                        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON blacklist
+                        FOR EACH STATEMENT EXECUTE FUNCTION notify_blacklist_changed();
+                    """))
+            except Exception as e:
+                logger.warning(f"⚠️ blacklist_changed trigger not created: {e}")
+
+            # Trigram GIN index lets `query ILIKE '%q%'` in get_policy_from_db use an index.
+            # Needs CREATE EXTENSION rights; without them lookups just stay seq scans.
+            try:
+                with conn.begin_nested():
+                    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
+                    conn.execute(text("""
+                        CREATE INDEX IF NOT EXISTS ix_policies_query_trgm
+                        ON policies USING gin (query gin_trgm_ops);
+                    """))
+            except Exception as e:
+                logger.warning(f"⚠️ pg_trgm index not created: {e}")
+
             seed_blacklist(conn)
             seed_policies(conn)
             conn.commit()
@@ -115,11 +207,13 @@ def seed_blacklist(conn) -> None:
         ("fake_vendor", "Reported fake invoices"),
         ("ghost_hospital", "Non-existent provider"),
     ]
-    for provider, reason in blacklist_data:
-        conn.execute(
-            text("INSERT INTO blacklist (provider, reason) VALUES (:provider, :reason) ON CONFLICT DO NOTHING"),
-            {"provider": provider, "reason": reason},
-        )
+    # One executemany instead of a round-trip per row
+    conn.execute(
+        text("INSERT INTO blacklist (provider, reason) VALUES (:provider, :reason) ON CONFLICT DO NOTHING"),
+        [{"provider": provider, "reason": reason} for provider, reason in blacklist_data],
+    )
+    invalidate_blacklist_cache()
+
 
 def seed_policies(conn) -> None:
     """Insert default policy guidance data."""
@@ -137,29 +231,168 @@ def seed_policies(conn) -> None:
             "Fraud Policy v1.0",
         ),
     ]
-    for q, r, d, s in policies:
-        conn.execute(
-            text(
-                "INSERT INTO policies (query, response, required_docs, source) VALUES (:q, :r, :d, :s) ON CONFLICT DO NOTHING"
-            ),
-            {"q": q, "r": r, "d": d, "s": s},
-        )
+    conn.execute(
+        text(
+            "INSERT INTO policies (query, response, required_docs, source) VALUES (:q, :r, :d, :s) ON CONFLICT DO NOTHING"
+        ),
+        [{"q": q, "r": r, "d": d, "s": s} for q, r, d, s in policies],
+    )
 
 
 # =========================================================
 # 🏥 Blacklist Utilities
 # =========================================================
-def get_blacklist_providers(db: Session) -> List[str]:
-    """Fetch all blacklisted provider names."""
+# In-process snapshot; dropped after the TTL, on seeding, or on `NOTIFY blacklist_changed`.
+# Immutable and published with a single assignment, so readers never see a tuple
+# from one load paired with the set from another.
+class _BlacklistSnapshot(NamedTuple):
+    providers: Tuple[str, ...]
+    names: FrozenSet[str]
+    loaded_at: float
+
+
+_BLACKLIST_SNAPSHOT: Optional[_BlacklistSnapshot] = None
+_BLACKLIST_TTL = getattr(config, "BLACKLIST_CACHE_TTL", 60)
+
+
+def invalidate_blacklist_cache() -> None:
+    """
+    Drop the whole in-process blacklist snapshot so the next lookup reloads
+    from the DB. Used on seeding, by the LISTEN handler, and between tests.
+    """
+    global _BLACKLIST_SNAPSHOT
+    _BLACKLIST_SNAPSHOT = None
+
+
+def _blacklist_snapshot(db: Session) -> _BlacklistSnapshot:
+    """Return the current snapshot, reloading it (lower-cased once, at load time) past the TTL."""
+    global _BLACKLIST_SNAPSHOT
+    snapshot = _BLACKLIST_SNAPSHOT
+    if snapshot is not None and time.monotonic() - snapshot.loaded_at < _BLACKLIST_TTL:
+        return snapshot
+
     result = db.execute(text("SELECT provider FROM blacklist"))
-    providers = [row[0].lower() for row in result.fetchall()]
+    providers = tuple(row[0].lower() for row in result.fetchall())
+    snapshot = _BlacklistSnapshot(providers, frozenset(providers), time.monotonic())
+    _BLACKLIST_SNAPSHOT = snapshot
     logger.debug(f"Loaded {len(providers)} blacklisted providers.")
-    return providers
+    return snapshot
+
+
+def get_blacklist_providers(db: Session) -> Tuple[str, ...]:
+    """Fetch all blacklisted provider names (lower-cased; cached for the TTL)."""
+    return _blacklist_snapshot(db).providers
+
+
+def get_blacklist_set(db: Session) -> FrozenSet[str]:
+    """Same snapshot as `get_blacklist_providers`, as a frozenset for O(1) exact-name lookups."""
+    return _blacklist_snapshot(db).names
+
+
+def _listen_blacklist_changes() -> None:
+    """Hold a dedicated Postgres connection on `LISTEN blacklist_changed`; reconnect on failure."""
+    listen_engine = create_engine(config.DB_URL, poolclass=NullPool)
+    while True:
+        raw = None
+        try:
+            raw = listen_engine.raw_connection()
+            conn = raw.driver_connection
+            conn.set_session(autocommit=True)
+            with conn.cursor() as cur:
+                cur.execute("LISTEN blacklist_changed")
+            logger.info("👂 Listening for blacklist_changed notifications.")
+            while True:
+                if select.select([conn], [], [], 60)[0]:
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        invalidate_blacklist_cache()
+                        logger.debug("🔄 Blacklist cache invalidated by NOTIFY.")
+        except Exception as e:
+            logger.warning(f"⚠️ Blacklist listener error (retrying in 5s): {e}")
+            time.sleep(5)
+        finally:
+            if raw is not None:
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+
+
+def start_blacklist_listener() -> Optional[threading.Thread]:
+    """Start the LISTEN/NOTIFY invalidation thread (Postgres only; TTL alone elsewhere)."""
+    if engine.dialect.name != "postgresql":
+        return None
+    thread = threading.Thread(target=_listen_blacklist_changes, name="blacklist-listener", daemon=True)
+    thread.start()
+    return thread
 
 
 # =========================================================
 # 💾 Claim Utilities
 # =========================================================
+# Core table (no ORM model) so bulk inserts can use insertmanyvalues + RETURNING.
+# A real Table with its primary key: `sort_by_parameter_order` needs it as the
+# sentinel that maps returned ids back to input rows. The DDL stays in init_db.
+_claims_table = Table(
+    "claims",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("claimant_id", String(255), nullable=False),
+    Column("amount", Numeric(10, 2), nullable=False),
+    Column("report_delay_days", Integer),
+    Column("provider", String(255), nullable=False),
+    Column("notes", Text),
+    Column("location", String(255)),
+    Column("timestamp", DateTime),
+    Column("is_new_bank", Boolean),
+    Column("fraud_probability", Float),
+    Column("decision", String(20)),
+    Column("alarms", JSON),
+)
+# Built once; SQLAlchemy's compiled cache then reuses the compiled SQL on every call
+_INSERT_CLAIMS = insert(_claims_table).returning(_claims_table.c.id, sort_by_parameter_order=True)
+
+
+def save_claims_bulk(
+    records: Iterable[Tuple[ClaimData, float, Decision, List[Dict[str, Any]]]],
+    db: Session,
+) -> List[int]:
+    """
+    Save many `(claim, fraud_prob, decision, alarms)` records in one batched
+    INSERT ... RETURNING id and a single commit. Returns ids in input order.
+    """
+    rows = [
+        {
+            "claimant_id": claim.claimant_id,
+            "amount": claim.amount,
+            "report_delay_days": claim.report_delay_days,
+            "provider": claim.provider,
+            "notes": claim.notes,
+            "location": claim.location,
+            "timestamp": claim.timestamp,
+            "is_new_bank": claim.is_new_bank,
+            "fraud_probability": fraud_prob,
+            "decision": decision.value,
+            "alarms": FRAUD_ALARMS_ADAPTER.dump_python(alarms, mode="json"),
+        }
+        for claim, fraud_prob, decision, alarms in records
+    ]
+    if not rows:
+        return []
+
+    try:
+        result = db.execute(_INSERT_CLAIMS, rows)
+        claim_ids = list(result.scalars().all())
+        db.commit()
+        logger.debug(f"💾 Saved {len(claim_ids)} claims")
+        return claim_ids
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Error saving claims: {e}")
+        raise
+
+
 def save_claim_to_db(
     claim: ClaimData,
     db: Session,
@@ -168,39 +401,9 @@ def save_claim_to_db(
     alarms: List[Dict[str, Any]],
 ) -> int:
     """Save a claim record with fraud metadata."""
-    try:
-        result = db.execute(
-            text("""
-                INSERT INTO claims (
-                    claimant_id, amount, report_delay_days, provider, notes, location,
-                    timestamp, is_new_bank, fraud_probability, decision, alarms
-                ) VALUES (
-                    :claimant_id, :amount, :delay, :provider, :notes, :loc,
-                    :ts, :is_new, :fraud, :decision, :alarms
-                ) RETURNING id
-            """),
-            {
-                "claimant_id": claim.claimant_id,
-                "amount": claim.amount,
-                "delay": claim.report_delay_days,
-                "provider": claim.provider,
-                "notes": claim.notes,
-                "loc": claim.location,
-                "ts": claim.timestamp,
-                "is_new": claim.is_new_bank,
-                "fraud": fraud_prob,
-                "decision": decision.value,
-                "alarms": [a.dict() for a in alarms],
-            },
-        )
-        claim_id = result.fetchone()[0]
-        db.commit()
-        logger.debug(f"💾 Claim saved ID={claim_id} for {claim.claimant_id}")
-        return claim_id
-    except Exception as e:
-        db.rollback()
-        logger.error(f"❌ Error saving claim: {e}")
-        raise
+    claim_id = save_claims_bulk([(claim, fraud_prob, decision, alarms)], db)[0]
+    logger.debug(f"💾 Claim saved ID={claim_id} for {claim.claimant_id}")
+    return claim_id
 
 
 def get_claimant_history(claimant_id: str, db: Session, months: int = 12) -> Dict[str, Any]:
@@ -210,7 +413,7 @@ def get_claimant_history(claimant_id: str, db: Session, months: int = 12) -> Dic
             text("""
                 SELECT COUNT(*) AS count, MAX(created_at) AS last_date, SUM(amount) AS total_amount
                 FROM claims
-                WHERE claimant_id = :id AND created_at > NOW() - INTERVAL ':months months'
+                WHERE claimant_id = :id AND created_at > NOW() - make_interval(months => :months)
             """),
             {"id": claimant_id, "months": months},
         )
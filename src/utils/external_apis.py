@@ -8,19 +8,65 @@ Handles integrations for:
 Includes Redis/in-memory caching for performance and fault tolerance.
 """
 
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, wraps
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from geopy.distance import geodesic
 from geopy.geocoders import Nominatim
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from src.config import config
 from src.utils.logger import logger
-from src.utils.cache import cache_get, cache_set
-from src.utils.db import get_blacklist_providers
+from src.utils.cache import SingleFlight, cache_get, cache_set
+from src.utils.db import get_blacklist_set
+
+# =========================================================
+# 🔌 Shared HTTP Clients (keep-alive, pooled, retried)
+# =========================================================
+# One pooled session per process: successive calls reuse TCP/TLS connections.
+# Only idempotent GETs go through it, so retrying 502/503/504 is safe; statuses
+# are returned (not raised) after the last retry so callers keep their fallbacks.
+_HTTP = requests.Session()
+_HTTP.headers["User-Agent"] = "FraudDetectionBot/1.0"
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    ),
+)
+_HTTP.mount("https://", _HTTP_ADAPTER)
+_HTTP.mount("http://", _HTTP_ADAPTER)
+_HTTP_TIMEOUT = (3, 10)  # (connect, read) seconds
+
+# Single geocoder (and its underlying HTTP session) reused across calls
+_GEOLOCATOR = Nominatim(user_agent="fraud_detection_bot", timeout=10)
+
+# Small pool for overlapping independent lookups (see `prefetch_external_checks`)
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ext-api")
+
+
+def _single_flight(key_fn: Callable[..., str]):
+    """Concurrent calls with the same key share one upstream request and its result."""
+    def decorator(fn):
+        flight = SingleFlight()
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            return flight.do(key_fn(*args, **kwargs), lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorator
 
 # =========================================================
 # 🌦️ WEATHER VALIDATION
 # =========================================================
+@_single_flight(lambda location, date: f"weather:{location}:{date}")
 def check_weather_at_location(location: str, date: str) -> Optional[Dict[str, Any]]:
     """
     Validate whether the weather data at a location matches claim conditions.
@@ -53,20 +99,21 @@ def check_weather_at_location(location: str, date: str) -> Optional[Dict[str, An
             params = {"q": location, "appid": config.WEATHER_API_KEY, "units": "metric"}
             expire = 3600
         elif days_diff <= 5:
-            # Historical API requires lat/lon
-            geoloc = Nominatim(user_agent="fraud_weather_bot").geocode(location)
-            if not geoloc:
+            # Historical API requires lat/lon; shares the geocode caches (keyed by location only)
+            try:
+                lat, lon = _geocode_l1(location)
+            except LookupError:
                 logger.warning(f"Could not geocode location: {location}")
                 return None
             timestamp = int(datetime.combine(target_date, datetime.min.time()).timestamp())
             url = "https://api.openweathermap.org/data/3.0/onecall/timemachine"
-            params = {"lat": geoloc.latitude, "lon": geoloc.longitude, "dt": timestamp, "appid": config.WEATHER_API_KEY, "units": "metric"}
+            params = {"lat": lat, "lon": lon, "dt": timestamp, "appid": config.WEATHER_API_KEY, "units": "metric"}
             expire = 86400
         else:
             logger.info(f"Historical weather unavailable (>5 days): {date}")
             return None
 
-        response = requests.get(url, params=params, timeout=10)
+        response = _HTTP.get(url, params=params, timeout=_HTTP_TIMEOUT)
         response.raise_for_status()
         data = response.json()
 
@@ -98,6 +145,8 @@ def check_weather_at_location(location: str, date: str) -> Optional[Dict[str, An
 # =========================================================
 # 🏥 VENDOR FRAUD CHECK
 # =========================================================
+# The DB fallback changes the answer, so callers with and without a session don't share a flight
+@_single_flight(lambda vendor_name, db_session=None: f"vendor:{vendor_name.lower().strip()}:{db_session is not None}")
 def check_vendor_fraud(vendor_name: str, db_session=None) -> Dict[str, Any]:
     """
     Check vendor fraud risk from API or DB fallback.
@@ -115,11 +164,10 @@ def check_vendor_fraud(vendor_name: str, db_session=None) -> Dict[str, Any]:
     try:
         # 🔹 1. Try external VendorCheck API
         if config.VENDOR_CHECK_API_URL:
-            resp = requests.get(
+            resp = _HTTP.get(
                 f"{config.VENDOR_CHECK_API_URL}/check",
                 params={"vendor": vendor_name},
-                headers={"User-Agent": "FraudDetectionBot/1.0"},
-                timeout=8,
+                timeout=(3, 8),
             )
             if resp.status_code == 200:
                 data = resp.json()
@@ -136,8 +184,8 @@ def check_vendor_fraud(vendor_name: str, db_session=None) -> Dict[str, Any]:
 
         # 🔹 2. Fallback — internal DB blacklist
         if db_session:
-            blacklisted = get_blacklist_providers(db_session)
-            is_fraud = vendor_lower in [p.lower() for p in blacklisted]
+            # Exact-name check: hash lookup, so the common "not listed" case doesn't scan the list
+            is_fraud = vendor_lower in get_blacklist_set(db_session)
             result = {
                 "vendor": vendor_name,
                 "is_fraudulent": is_fraud,
@@ -158,43 +206,56 @@ def check_vendor_fraud(vendor_name: str, db_session=None) -> Dict[str, Any]:
 # =========================================================
 # 📍 GEOLOCATION CHECK
 # =========================================================
+@_single_flight(lambda addr: f"geocode:{addr}")
+def _geocode_cached(addr: str) -> Optional[Dict[str, float]]:
+    """Geocode an address via Nominatim, cached for 1h."""
+    key = f"geocode:{addr}"
+    cached_geo = cache_get(key)
+    if cached_geo:
+        return cached_geo
+    geo = _GEOLOCATOR.geocode(addr)
+    if not geo:
+        return None
+    coords = {"latitude": geo.latitude, "longitude": geo.longitude}
+    cache_set(key, coords, expire_seconds=3600)
+    return coords
+
+
+@lru_cache(maxsize=4096)
+def _geocode_l1(addr: str) -> Tuple[float, float]:
+    """
+    In-process L1 over `_geocode_cached`: hot addresses skip even the cache
+    lookup. Misses raise LookupError, which `lru_cache` does not memoize, so a
+    failed geocode is retried next time.
+    """
+    coords = _geocode_cached(addr)
+    if not coords:
+        raise LookupError(addr)
+    return coords["latitude"], coords["longitude"]
+
+
 def calculate_location_distance(addr1: str, addr2: str) -> Optional[float]:
     """
     Calculate distance (miles) between two addresses using Geopy (Nominatim).
     - Uses caching for geocodes (1h)
     - Handles failures gracefully (returns None)
     """
-    cache_key = f"distance:{addr1}:{addr2}"
+    # Distance is symmetric: A→B and B→A share one entry
+    cache_key = "distance:" + "|".join(sorted((addr1.lower(), addr2.lower())))
     cached = cache_get(cache_key)
     if cached:
         logger.debug(f"Cache hit for distance: {addr1} → {addr2}")
         return cached
 
     try:
-        geolocator = Nominatim(user_agent="fraud_detection_bot", timeout=10)
-
-        def get_or_cache_geocode(addr: str):
-            key = f"geocode:{addr}"
-            cached_geo = cache_get(key)
-            if cached_geo:
-                return cached_geo
-            geo = geolocator.geocode(addr)
-            if not geo:
-                return None
-            coords = {"latitude": geo.latitude, "longitude": geo.longitude}
-            cache_set(key, coords, expire_seconds=3600)
-            return coords
-
-        loc1 = get_or_cache_geocode(addr1)
-        loc2 = get_or_cache_geocode(addr2)
-        if not loc1 or not loc2:
+        try:
+            loc1 = _geocode_l1(addr1)
+            loc2 = _geocode_l1(addr2)
+        except LookupError:
             logger.warning(f"⚠️ Geocode failed for '{addr1}' or '{addr2}'")
             return None
 
-        distance = geodesic(
-            (loc1["latitude"], loc1["longitude"]),
-            (loc2["latitude"], loc2["longitude"]),
-        ).miles
+        distance = geodesic(loc1, loc2).miles
 
         cache_set(cache_key, distance, expire_seconds=3600)
         logger.debug(f"📍 Distance between '{addr1}' and '{addr2}': {distance:.2f} miles")
@@ -204,6 +265,30 @@ def calculate_location_distance(addr1: str, addr2: str) -> Optional[float]:
         return None
 
 
+# =========================================================
+# ⚡ CONCURRENT PREFETCH
+# =========================================================
+def prefetch_external_checks(
+    location: Optional[str] = None,
+    date: Optional[str] = None,
+    vendor_name: Optional[str] = None,
+) -> List[Future]:
+    """
+    Start the independent HTTP lookups for one claim in parallel so they
+    overlap instead of running back to back. Results land in the cache the
+    rule checks read from; wait on the returned futures before running them.
+    Only DB-free lookups are prefetched (a Session must stay on its thread).
+    """
+    futures: List[Future] = []
+    if location:
+        futures.append(_PREFETCH_POOL.submit(_geocode_cached, location))
+        if date:
+            futures.append(_PREFETCH_POOL.submit(check_weather_at_location, location, date))
+    if vendor_name and config.VENDOR_CHECK_API_URL:
+        futures.append(_PREFETCH_POOL.submit(check_vendor_fraud, vendor_name))
+    return futures
+
+
 # =========================================================
 # 🧪 Local Testing
 # =========================================================
@@ -0,0 +1,71 @@
+"""
+Health Fast-Path Middleware
+---------------------------
+Serves `/health` straight from a pre-serialized cache, ahead of routing.
+
+Features:
+- `HealthCache` holds the latest health payload as JSON bytes + refresh time.
+- `HealthFastPath` answers GET/HEAD `/health` from that cache without touching
+  the router, dependencies, or the rest of the middleware stack.
+- Stale or empty cache → request falls through to the regular `/health` route,
+  which re-probes and refreshes the cache.
+
+Usage:
+    from src.utils.health_middleware import HealthCache, HealthFastPath
+    cache = HealthCache()
+    app.add_middleware(HealthFastPath, cache=cache, max_age=10.0)  # add last
+"""
+
+import time
+from typing import Any, Dict
+
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class HealthCache:
+    """Latest health payload, serialized once per refresh."""
+
+    def __init__(self):
+        self.payload: Dict[str, Any] = {}
+        self.payload_bytes: bytes = b""
+        self.updated_at: float = float("-inf")
+
+    def update(self, payload: Dict[str, Any]) -> None:
+        self.payload = payload
+        self.payload_bytes = orjson.dumps(payload)
+        self.updated_at = time.monotonic()
+
+    def is_fresh(self, max_age: float) -> bool:
+        return time.monotonic() - self.updated_at < max_age
+
+
+class HealthFastPath:
+    """Pure ASGI middleware answering the health path from `HealthCache`."""
+
+    def __init__(self, app: ASGIApp, cache: HealthCache, path: str = "/health", max_age: float = 10.0):
+        self.app = app
+        self.cache = cache
+        self.path = path
+        self.max_age = max_age
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["path"] == self.path
+            and scope["method"] in ("GET", "HEAD")
+            and self.cache.is_fresh(self.max_age)
+        ):
+            body = self.cache.payload_bytes
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body if scope["method"] == "GET" else b""})
+            return
+
+        await self.app(scope, receive, send)
@@ -1,13 +1,16 @@
+import atexit
 import logging
-import json
+import queue
 import sys
 import os
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+import threading
+from datetime import datetime, timezone
+import orjson
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 from src.config import config
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 # =========================================================
 # 🧱 Global Logger Setup
@@ -25,18 +28,21 @@ if logger.hasHandlers():
 class JSONFormatter(logging.Formatter):
     """JSON format for structured logs (ideal for AWS CloudWatch & ELK)."""
     def format(self, record: logging.LogRecord) -> str:
+        # `record.created` is stamped at log time — no extra clock read; orjson is C-fast
+        attrs = record.__dict__
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
             "level": record.levelname,
             "message": record.getMessage(),
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
-            "claimant_id": getattr(record, "claimant_id", "anonymous"),
+            "claimant_id": attrs.get("claimant_id", "anonymous"),
         }
-        if hasattr(record, "extra"):
-            log_entry.update(record.extra)
-        return json.dumps(log_entry)
+        extra = attrs.get("extra")
+        if extra:
+            log_entry.update(extra)
+        return orjson.dumps(log_entry, default=str).decode()
 
 class ColoredFormatter(logging.Formatter):
     """Simple color-coded output for dev mode."""
@@ -57,27 +63,61 @@ console_handler.setFormatter(
 )
 logger.addHandler(console_handler)
 
+# Slow sinks (disk, CloudWatch) are fed through a QueueListener thread — see below
+_queued_handlers: List[logging.Handler] = []
+
 # =========================================================
 # 📁 File Handler (Rotating)
 # =========================================================
+log_file = None
 if not config.DEBUG:
     log_file = "fraud_chatbot.log"
-    file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=5)
+    # delay=True: the file is opened on the first record, not at import
+    file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=5, delay=True)
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(JSONFormatter())
-    logger.addHandler(file_handler)
-    logger.info(f"File logging active: {log_file}")
+    _queued_handlers.append(file_handler)
 
 # =========================================================
 # ☁️ CloudWatch Handler (AWS Integration)
 # =========================================================
+# The flusher's own diagnostics go to the console only, never back into CloudWatch
+_cw_logger = logging.getLogger("fraud_chatbot.cloudwatch")
+_cw_logger.propagate = False
+_cw_logger.addHandler(console_handler)
+
+
 class CloudWatchHandler(logging.Handler):
-    def __init__(self, log_group: str, log_stream: str):
+    """
+    Buffers records and ships them in batches from a daemon thread, so a log
+    call never waits on a signed HTTPS round-trip. A batch goes out every
+    `flush_interval` seconds or `batch_size` records, whichever comes first;
+    when the bounded queue is full new records are dropped (and counted).
+    """
+
+    def __init__(
+        self,
+        log_group: str,
+        log_stream: str,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+    ):
         super().__init__()
         self.log_group = log_group
         self.log_stream = log_stream
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
         self.sequence_token = None
+        self.dropped = 0
+        self._queue: "queue.Queue[Tuple[int, str]]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self.setFormatter(JSONFormatter())
         self.client = self._init_client()
+        self._thread: Optional[threading.Thread] = None
+        if self.client:
+            self._thread = threading.Thread(target=self._run, name="cloudwatch-logs", daemon=True)
+            self._thread.start()
 
     def _init_client(self):
         try:
@@ -104,28 +144,67 @@ class CloudWatchHandler(logging.Handler):
         if not self.client:
             return
         try:
-            message = JSONFormatter().format(record)
-            log_event = {
-                "logGroupName": self.log_group,
-                "logStreamName": self.log_stream,
-                "logEvents": [
-                    {"timestamp": int(datetime.utcnow().timestamp() * 1000), "message": message}
-                ],
-            }
+            self._queue.put_nowait((int(record.created * 1000), self.format(record)))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def _drain(self) -> List[Tuple[int, str]]:
+        """Block up to `flush_interval` for the first record, then take what is queued (≤ batch_size)."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._drain()
+            if batch:
+                self._send(batch)
+        # Final flush on close()
+        while not self._queue.empty():
+            self._send(self._drain())
+
+    def _send(self, batch: List[Tuple[int, str]]) -> None:
+        if not batch:
+            return
+        # CloudWatch requires chronological order within a batch
+        batch.sort(key=lambda item: item[0])
+        log_event = {
+            "logGroupName": self.log_group,
+            "logStreamName": self.log_stream,
+            "logEvents": [{"timestamp": ts, "message": msg} for ts, msg in batch],
+        }
+        # One retry with a refreshed token — iterative, never recursive
+        for attempt in range(2):
             if self.sequence_token:
                 log_event["sequenceToken"] = self.sequence_token
+            try:
+                response = self.client.put_log_events(**log_event)
+                self.sequence_token = response.get("nextSequenceToken")
+                return
+            except ClientError as e:
+                if attempt == 0 and "InvalidSequenceTokenException" in str(e):
+                    self.sequence_token = self._get_latest_token()
+                    continue
+                _cw_logger.error(f"CloudWatch emit error ({len(batch)} events dropped): {e}")
+                return
+            except Exception as e:
+                _cw_logger.error(f"CloudWatch emit error ({len(batch)} events dropped): {e}")
+                return
 
-            response = self.client.put_log_events(**log_event)
-            self.sequence_token = response.get("nextSequenceToken")
-        except ClientError as e:
-            # AWS CloudWatch often requires sequence token retry
-            if "InvalidSequenceTokenException" in str(e):
-                token = self._get_latest_token()
-                if token:
-                    self.sequence_token = token
-                    self.emit(record)
-            else:
-                logger.error(f"CloudWatch emit error: {e}")
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        super().close()
 
     def _get_latest_token(self) -> str:
         """Fetch latest sequence token if invalid."""
@@ -138,14 +217,31 @@ class CloudWatchHandler(logging.Handler):
             if streams:
                 return streams[0].get("uploadSequenceToken")
         except Exception as e:
-            logger.error(f"Error getting CloudWatch sequence token: {e}")
+            _cw_logger.error(f"Error getting CloudWatch sequence token: {e}")
         return None
 
 # Enable CloudWatch if AWS creds present
 if os.getenv("AWS_ACCESS_KEY_ID") and os.getenv("AWS_SECRET_ACCESS_KEY"):
     cw_handler = CloudWatchHandler("fraud-chatbot-logs", "fraud-api-stream")
     cw_handler.setLevel(logging.INFO)
-    logger.addHandler(cw_handler)
+    _queued_handlers.append(cw_handler)
+
+# =========================================================
+# 🧵 Queue Listener (log I/O off the request thread)
+# =========================================================
+# The request thread only enqueues; formatting, disk writes and rotation run on
+# the listener thread. Console output stays synchronous.
+if _queued_handlers:
+    _log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = QueueHandler(_log_queue)
+    queue_handler.setLevel(min(h.level for h in _queued_handlers))
+    logger.addHandler(queue_handler)
+    _listener = QueueListener(_log_queue, *_queued_handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+if log_file:
+    logger.info(f"File logging active: {log_file}")
 
 # =========================================================
 # 🧩 Context-Aware Logging Decorator
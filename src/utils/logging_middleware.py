@@ -8,88 +8,151 @@ Features:
 - Measures latency for performance insights.
 - Outputs JSON-style logs for CloudWatch / ELK compatibility.
 - Integrates with the global logger (`src.utils.logger`).
+- Optional per-path sampling for high-traffic endpoints (probes, `/`).
 
 Usage:
     from src.utils.logging_middleware import LoggingMiddleware
     app.add_middleware(LoggingMiddleware)
 """
 
-import json
+import logging
+import random
 import time
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
-from typing import Optional
+
+import orjson
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Optional
 from src.utils.logger import logger
 
+# Log timestamps have one-second resolution, so the formatted string is reused
+# until the second rolls over (strftime is relatively costly per call).
+_ts_cache = [-1, ""]
+
+
+def _utc_timestamp() -> str:
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[1] = "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}Z".format(*time.gmtime(now)[:6])
+        _ts_cache[0] = now
+    return _ts_cache[1]
+
+
+def _response_content_length(message: Optional[Message]) -> str:
+    """Read content-length straight off the raw ASGI headers; no Headers object per response."""
+    if message:
+        for name, value in message.get("headers", ()):
+            if name.lower() == b"content-length":
+                return value.decode("latin-1")
+    return "unknown"
+
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """
     Middleware for centralized structured API logging.
+
+    Implemented as a pure ASGI middleware: unlike BaseHTTPMiddleware it does not
+    spawn an extra task or memory stream per request.
     """
 
-    def __init__(self, app: ASGIApp, skip_paths: Optional[list[str]] = None):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        skip_paths: Optional[list[str]] = None,
+        sample_paths: Optional[Dict[str, float]] = None,
+    ):
+        self.app = app
         self.skip_paths = skip_paths or ["/health", "/metrics"]
+        # Tuple form lets str.startswith check every prefix in one C call
+        self._skip_prefixes = tuple(self.skip_paths)
+        # Exact path -> fraction of requests logged (e.g. {"/health": 0.1}).
+        self.sample_paths = sample_paths or {}
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Log request start, completion, and response metadata.
         """
-        if any(request.url.path.startswith(p) for p in self.skip_paths):
-            # Skip health checks to avoid log noise
-            return await call_next(request)
-
-        start_time = time.perf_counter()
-        request_id = request.headers.get("X-Request-ID", str(int(time.time() * 1000)))
-
-        log_entry = {
-            "event": "request_start",
-            "method": request.method,
-            "path": request.url.path,
-            "query_params": str(request.query_params),
-            "client_host": request.client.host if request.client else "unknown",
-            "user_agent": request.headers.get("User-Agent", "unknown"),
-            "request_id": request_id,
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        }
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        logger.info(json.dumps(log_entry))
+        path = scope["path"]
+        if path.startswith(self._skip_prefixes):
+            # Skip health checks to avoid log noise
+            await self.app(scope, receive, send)
+            return
 
-        try:
-            response: Response = await call_next(request)
-            latency = round((time.perf_counter() - start_time) * 1000, 2)
+        if random.random() >= self.sample_paths.get(path, 1.0):
+            # Sampled out: no logging work at all for this request
+            await self.app(scope, receive, send)
+            return
 
-            response_log = {
-                "event": "request_end",
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "latency_ms": latency,
-                "content_length": response.headers.get("content-length", "unknown"),
+        start_time = time.perf_counter()
+        # Skip building/serializing the info records when INFO is filtered out
+        log_info = logger.isEnabledFor(logging.INFO)
+        method = scope["method"]
+        headers = Headers(scope=scope)
+        client = scope.get("client")
+        request_id = headers.get("x-request-id", str(int(time.time() * 1000)))
+
+        if log_info:
+            # Size comes from the header; the body stream is never read here
+            content_length = headers.get("content-length", "")
+            log_entry = {
+                "event": "request_start",
+                "method": method,
+                "path": path,
+                "query_params": scope.get("query_string", b"").decode("latin-1"),
+                "client_host": client[0] if client else "unknown",
+                "user_agent": headers.get("user-agent", "unknown"),
+                "content_length": int(content_length) if content_length.isdigit() else 0,
                 "request_id": request_id,
-                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "timestamp": _utc_timestamp(),
             }
+            logger.info(orjson.dumps(log_entry).decode())
+
+        response_start: Optional[Message] = None
 
-            logger.info(json.dumps(response_log))
-            return response
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_start
+            if message["type"] == "http.response.start":
+                response_start = message
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # Catch and log any unhandled exceptions
             latency = round((time.perf_counter() - start_time) * 1000, 2)
             error_log = {
                 "event": "request_error",
-                "method": request.method,
-                "path": request.url.path,
+                "method": method,
+                "path": path,
                 "error": str(e),
                 "latency_ms": latency,
                 "request_id": request_id,
-                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "timestamp": _utc_timestamp(),
             }
-            logger.error(json.dumps(error_log))
+            logger.error(orjson.dumps(error_log).decode())
             raise e
 
+        if not log_info:
+            return
+
+        latency = round((time.perf_counter() - start_time) * 1000, 2)
+
+        response_log = {
+            "event": "request_end",
+            "method": method,
+            "path": path,
+            "status_code": response_start["status"] if response_start else 500,
+            "latency_ms": latency,
+            "content_length": _response_content_length(response_start),
+            "request_id": request_id,
+            "timestamp": _utc_timestamp(),
+        }
+        logger.info(orjson.dumps(response_log).decode())
+
 
 # =========================================================
 # Example Integration (in src/main.py)
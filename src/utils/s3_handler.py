@@ -5,7 +5,11 @@ Unified helper for uploading, downloading, and listing claim files
 (e.g., invoices, documents, ML models) to S3 or local MinIO.
 """
 
+import io
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError, NoCredentialsError, EndpointConnectionError
 from typing import Optional, List
 from datetime import datetime
@@ -14,6 +18,17 @@ from src.utils.logger import logger
 import os
 import json
 
+_MB = 1024 * 1024
+
+# Multipart for anything past the threshold, parts uploaded in parallel;
+# sized via S3_MULTIPART_THRESHOLD_MB / S3_MULTIPART_CHUNK_MB / S3_MAX_CONCURRENCY.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=config.S3_MULTIPART_THRESHOLD_MB * _MB,
+    multipart_chunksize=config.S3_MULTIPART_CHUNK_MB * _MB,
+    max_concurrency=config.S3_MAX_CONCURRENCY,
+    use_threads=True,
+)
+
 
 class S3Handler:
     def __init__(self):
@@ -33,6 +48,8 @@ class S3Handler:
                 endpoint_url=endpoint_url or None,
                 aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
                 aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+                # Enough pooled connections for every concurrent part upload (botocore default is 10)
+                config=BotoConfig(max_pool_connections=max(10, config.S3_MAX_CONCURRENCY)),
             )
 
             # Check bucket existence (soft validation)
@@ -72,33 +89,38 @@ class S3Handler:
                 self.bucket_name,
                 s3_key,
                 ExtraArgs={"ContentType": content_type, "ServerSideEncryption": "AES256"},
+                Config=TRANSFER_CONFIG,
             )
             s3_url = f"https://{self.bucket_name}.s3.{config.AWS_REGION}.amazonaws.com/{s3_key}"
             logger.info(f"📤 Uploaded {file_path} to {s3_url}")
             return s3_url
-        except ClientError as e:
+        except (ClientError, S3UploadFailedError) as e:
             logger.error(f"❌ Upload failed: {e}")
             return None
 
     def upload_bytes(
         self, data: bytes, s3_key: str, content_type: str = "application/octet-stream"
     ) -> Optional[str]:
-        """Upload binary content (e.g., OCR output or in-memory PDF)."""
+        """
+        Upload binary content (e.g., OCR output or in-memory PDF).
+        Small payloads go up as a single PUT; large ones use parallel multipart.
+        """
         if not self.s3_client:
             return None
 
         try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=data,
-                ContentType=content_type,
-                ServerSideEncryption="AES256",
+            self.s3_client.upload_fileobj(
+                io.BytesIO(data),
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={"ContentType": content_type, "ServerSideEncryption": "AES256"},
+                Config=TRANSFER_CONFIG,
             )
             s3_url = f"https://{self.bucket_name}.s3.{config.AWS_REGION}.amazonaws.com/{s3_key}"
             logger.info(f"📦 Uploaded bytes to {s3_url}")
             return s3_url
-        except ClientError as e:
+        except (ClientError, S3UploadFailedError) as e:
+            # The transfer manager wraps part/PUT failures in S3UploadFailedError
             logger.error(f"❌ Error uploading bytes to S3: {e}")
             return None
 
@@ -12,9 +12,12 @@ import os
 import re
 import hashlib
 import secrets
+import threading
+import time
 import jwt
+from collections import OrderedDict
 from jwt import ExpiredSignatureError, InvalidTokenError
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -65,6 +68,37 @@ def verify_jwt_token(token: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+# Verified payloads keyed by token, held until the token's own `exp`.
+# Only successfully verified tokens with an expiry are cached.
+_VERIFIED_CACHE_SIZE = 4096
+_verified_tokens: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_verified_lock = threading.Lock()
+
+
+def verify_jwt_token_cached(token: str) -> Optional[Dict[str, Any]]:
+    """
+    `verify_jwt_token` with a per-token LRU, so a client reusing one bearer
+    token pays for signature verification once, not on every request.
+    """
+    with _verified_lock:
+        entry = _verified_tokens.get(token)
+        if entry is not None:
+            payload, exp = entry
+            if exp > time.time():
+                _verified_tokens.move_to_end(token)
+                return dict(payload)
+            del _verified_tokens[token]
+
+    payload = verify_jwt_token(token)
+    if payload and "exp" in payload:
+        with _verified_lock:
+            _verified_tokens[token] = (payload, float(payload["exp"]))
+            if len(_verified_tokens) > _VERIFIED_CACHE_SIZE:
+                _verified_tokens.popitem(last=False)
+        return dict(payload)
+    return payload
+
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Optional[Dict[str, Any]]:
     """
     Extract user info from JWT in Authorization header.
@@ -81,7 +115,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = verify_jwt_token(token)
+    payload = verify_jwt_token_cached(token)
     return {"user_id": payload.get("sub"), "role": payload.get("role", "user")}
 
 
@@ -115,6 +149,20 @@ def anonymize_pii(data: str, method: str = "sha256") -> str:
 # =========================================================
 # 🧼 Input Sanitization
 # =========================================================
+# Compiled once at import. Applied in order (not fused into one alternation):
+# stripping one pattern can expose another, e.g. "SEL<script></script>ECT".
+_DANGEROUS_PATTERNS = tuple(
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"<script.*?>.*?</script>",
+        r"on\w+\s*=",
+        r"javascript:",
+        r"\b(SELECT|INSERT|UPDATE|DELETE|DROP|UNION|EXEC|ALTER|CREATE|GRANT|REVOKE)\b",
+    )
+)
+_CONTROL_CHARS = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+
+
 def sanitize_input(text: str) -> str:
     """
     Remove common XSS/SQL injection patterns and limit input length.
@@ -124,18 +172,11 @@ def sanitize_input(text: str) -> str:
         return ""
 
     text = text[:1000]  # Max length
-    dangerous_patterns = [
-        r"<script.*?>.*?</script>",
-        r"on\w+\s*=",
-        r"javascript:",
-        r"\b(SELECT|INSERT|UPDATE|DELETE|DROP|UNION|EXEC|ALTER|CREATE|GRANT|REVOKE)\b",
-    ]
-
-    for pattern in dangerous_patterns:
-        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+    for pattern in _DANGEROUS_PATTERNS:
+        text = pattern.sub("", text)
 
     # Strip control characters and whitespace
-    text = re.sub(r"[\x00-\x1f\x7f-\x9f]", "", text).strip()
+    text = _CONTROL_CHARS.sub("", text).strip()
 
     logger.debug(f"Sanitized input ({len(text)} chars): {text[:60]}...")
     return text
@@ -75,6 +75,11 @@ def mock_external_services(monkeypatch):
     # Mock ML/NLP model loading to avoid GPU/memory load
     monkeypatch.setattr("src.nlp.text_analyzer.load_nlp_models", lambda: True, raising=False)
     monkeypatch.setattr("src.nlp.text_analyzer.get_text_similarity", lambda t1, t2: 0.8, raising=False)
+    monkeypatch.setattr(
+        "src.nlp.text_analyzer.get_text_similarities",
+        lambda text, others: [0.8] * len(others),
+        raising=False,
+    )
 
     # ✅ FIX: Correct mocking for RedisCache (class inside cache.py)
     from src.utils.cache import RedisCache
@@ -86,6 +91,18 @@ def mock_external_services(monkeypatch):
     yield
 
 
+# =========================================================
+# 🧹 Module-Level Cache Isolation
+# =========================================================
+@pytest.fixture(autouse=True)
+def reset_blacklist_cache():
+    """Start and end every test with an empty in-process blacklist snapshot."""
+    from src.utils.db import invalidate_blacklist_cache
+    invalidate_blacklist_cache()
+    yield
+    invalidate_blacklist_cache()
+
+
 # =========================================================
 # 🌐 FastAPI Test Client (for API tests)
 # =========================================================
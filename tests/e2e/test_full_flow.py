@@ -75,6 +75,11 @@ def mock_external_services(monkeypatch):
     # ✅ NLP mocks
     monkeypatch.setattr("src.nlp.text_analyzer.load_nlp_models", lambda: True, raising=False)
     monkeypatch.setattr("src.nlp.text_analyzer.get_text_similarity", lambda t1, t2: 0.8, raising=False)
+    monkeypatch.setattr(
+        "src.nlp.text_analyzer.get_text_similarities",
+        lambda text, others: [0.8] * len(others),
+        raising=False,
+    )
 
     # ✅ Redis mock (avoid real connection)
     from src.utils.cache import RedisCache
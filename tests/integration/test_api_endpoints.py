@@ -160,3 +160,13 @@ def test_root_endpoint_metadata(client):
     assert "version" in data
     assert "status" in data
     assert "timestamp" in data
+
+
+@patch("src.utils.auth_middleware.config.DEBUG", False)
+def test_metrics_endpoint_exposition(client):
+    """GET /metrics answers 200 directly (no redirect, no token) in Prometheus text format."""
+    response = client.get("/metrics", follow_redirects=False)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE fraud_api_uptime_seconds gauge" in response.text
+    assert "fraud_api_db_up " in response.text
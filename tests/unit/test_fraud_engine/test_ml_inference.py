@@ -127,3 +127,24 @@ def test_train_synthetic_model(tmp_path):
     model_path = tmp_path / "fraud_model.pkl"
     train_synthetic_model(str(model_path))
     assert model_path.exists()
+
+
+# =========================================================
+# 🧮 Feature Matrix
+# =========================================================
+def test_batch_to_matrix_stacks_feature_rows():
+    items = [
+        FraudFeatures(amount_normalized=0.5, is_new_bank=True),
+        FraudFeatures(delay_days=3, vendor_risk_score=0.9),
+    ]
+    matrix = FraudFeatures.batch_to_matrix(items)
+    assert matrix.shape == (2, 14)
+    assert matrix.dtype == np.float32 and matrix.flags["C_CONTIGUOUS"]
+    assert np.allclose(matrix[0], items[0].to_array())
+    assert matrix[1, 1] == 3
+
+
+def test_fraud_features_are_frozen():
+    features = FraudFeatures(delay_days=2)
+    with pytest.raises(Exception):
+        features.delay_days = 5
@@ -0,0 +1,52 @@
+"""
+Unit Tests: Batch Scoring
+-------------------------
+Covers src/services/fraud_engine.py score_claims_batch.
+Validates:
+- Parity with score_claim on randomized claims (incl. rule boundaries, None fields)
+- Parity holds when the rule table changes
+- Empty input
+
+Run:
+    pytest tests/unit/test_fraud_engine/test_score_claims_batch.py -v
+"""
+
+import random
+
+from src.services import fraud_engine
+from src.services.fraud_engine import score_claim, score_claims_batch
+
+
+def _random_claims(n: int, seed: int = 1234):
+    rng = random.Random(seed)
+    providers = [None, "", "City Hospital", "shady_clinic", "Shady Labs", "fake_vendor", "Good Clinic"]
+    return [
+        {
+            "claimant_id": f"c{i}",
+            "amount": rng.choice([None, 0, 9999.99, 10000, 10000.01, rng.uniform(0, 50000)]),
+            "provider": rng.choice(providers),
+            "report_delay_days": rng.choice([None, 0, 7, 8, rng.randint(0, 60)]),
+            "is_new_bank": rng.choice([True, False, None]),
+        }
+        for i in range(n)
+    ]
+
+
+class TestScoreClaimsBatch:
+    """score_claims_batch must agree with score_claim claim by claim."""
+
+    def test_matches_score_claim_on_random_claims(self):
+        claims = _random_claims(2000)
+        assert score_claims_batch(claims) == [score_claim(c) for c in claims]
+
+    def test_matches_score_claim_after_rule_change(self, monkeypatch):
+        """Batch scoring follows _RULES, so editing a rule cannot make the two diverge."""
+        rules = list(fraud_engine._RULES)
+        rules[0] = (lambda c: (c.get("amount") or 0) > 5000, 55, "high_amount")
+        monkeypatch.setattr(fraud_engine, "_RULES", tuple(rules))
+
+        claims = _random_claims(500, seed=99)
+        assert score_claims_batch(claims) == [score_claim(c) for c in claims]
+
+    def test_empty_batch(self):
+        assert score_claims_batch([]) == []
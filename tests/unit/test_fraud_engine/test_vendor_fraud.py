@@ -0,0 +1,43 @@
+"""
+Unit Tests: Vendor Fraud Rule
+-----------------------------
+Covers src/fraud_engine/rules/vendor_fraud.py blacklist matching.
+"""
+
+from unittest.mock import patch
+
+from src.models.claim import ClaimData
+from src.fraud_engine.rules.vendor_fraud import check_vendor_fraud, is_blacklisted_provider
+
+
+BLACKLIST = ["shady_clinic", "fake_vendor", "ghost_hospital"]
+
+
+# =========================================================
+# 🏥 Blacklist Matching
+# =========================================================
+def test_blacklist_exact_and_substring_match():
+    """Provider matches when it appears inside a blacklisted entry (lower-cased input)."""
+    assert is_blacklisted_provider("shady_clinic", BLACKLIST)
+    assert is_blacklisted_provider("ghost", BLACKLIST)
+    assert not is_blacklisted_provider("trusted_clinic", BLACKLIST)
+
+
+def test_blacklist_match_does_not_span_entries():
+    """A provider straddling two joined entries must not match."""
+    assert not is_blacklisted_provider("clinicfake", BLACKLIST)
+    assert not is_blacklisted_provider("", BLACKLIST)
+    assert not is_blacklisted_provider("anything", [])
+
+
+# =========================================================
+# 🚨 Rule Integration
+# =========================================================
+@patch("src.fraud_engine.rules.vendor_fraud.check_vendor_risk", return_value={})
+@patch("src.fraud_engine.rules.vendor_fraud.get_blacklist_providers", return_value=BLACKLIST)
+def test_check_vendor_fraud_blacklist_hit(mock_blacklist, mock_risk):
+    """Blacklisted provider raises both the blacklist and the combined vendor alarm."""
+    claim = ClaimData(claimant_id="u1", amount=100.0, provider="Shady_Clinic")
+    alarms = check_vendor_fraud(claim, db=object())
+    assert len(alarms) == 2
+    assert all(a.startswith("[VENDOR-FRAUD]") for a in alarms)
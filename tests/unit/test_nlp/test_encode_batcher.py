@@ -0,0 +1,52 @@
+"""
+Unit Tests: Encode Micro-Batcher
+--------------------------------
+Covers src/nlp/text_analyzer.py `_EncodeBatcher` batching and its timeout fallback.
+"""
+
+import threading
+
+import numpy as np
+
+from src.nlp.text_analyzer import _EncodeBatcher
+
+
+class _FakeModel:
+    """Encodes each text as [len(text), 1]; optionally blocks calls made from the batcher thread."""
+
+    def __init__(self, block_worker: bool = False):
+        self.block_worker = block_worker
+        self.release = threading.Event()
+        self.calls = []
+
+    def encode(self, texts, **_):
+        self.calls.append((threading.current_thread().name, list(texts)))
+        if self.block_worker and threading.current_thread().name == "nlp-encode-batcher":
+            self.release.wait(5)
+        return np.array([[float(len(t)), 1.0] for t in texts])
+
+
+# =========================================================
+# 📦 Batching
+# =========================================================
+def test_encode_returns_rows_in_request_order():
+    batcher = _EncodeBatcher(max_wait=0.001, timeout=5)
+    embs = batcher.encode(_FakeModel(), ["a", "bbb"])
+    assert embs[:, 0].tolist() == [1.0, 3.0]
+
+
+# =========================================================
+# ⏱️ Timeout Fallback
+# =========================================================
+def test_stuck_batch_falls_back_to_direct_encode():
+    model = _FakeModel(block_worker=True)
+    batcher = _EncodeBatcher(max_wait=0.001, timeout=0.2)
+    try:
+        # First call wedges the worker; it must still come back via the direct path
+        assert batcher.encode(model, ["abcd"])[:, 0].tolist() == [4.0]
+        # Queued behind the stuck batch: also answered directly, not blocked forever
+        assert batcher.encode(model, ["xy"])[:, 0].tolist() == [2.0]
+    finally:
+        model.release.set()
+    direct = [texts for name, texts in model.calls if name != "nlp-encode-batcher"]
+    assert direct == [["abcd"], ["xy"]]
@@ -0,0 +1,27 @@
+"""
+Unit Tests: OCR Worker
+----------------------
+Covers src/nlp/ocr_worker.py `ocr_image` Tesseract handle reuse and fallback.
+"""
+
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from src.nlp import ocr_worker
+
+
+def test_failed_tesserocr_init_falls_back_once(monkeypatch):
+    monkeypatch.setattr(ocr_worker, "_TESS_API", None)
+    monkeypatch.setattr(ocr_worker, "_TESS_INIT_ATTEMPTED", False)
+    open_api = MagicMock(return_value=None)
+    recognize = MagicMock(return_value="text")
+    monkeypatch.setattr(ocr_worker, "_open_tess_api", open_api)
+    monkeypatch.setattr(ocr_worker, "_recognize", recognize)
+
+    img = Image.new("RGB", (64, 64), "white")
+    assert ocr_worker.ocr_image(img) == "text"
+    assert ocr_worker.ocr_image(img) == "text"
+
+    open_api.assert_called_once()
+    assert [c.args[0] for c in recognize.call_args_list] == [None, None]
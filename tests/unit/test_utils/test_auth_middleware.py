@@ -0,0 +1,77 @@
+"""
+Unit Tests: Auth Middleware
+---------------------------
+Covers src/utils/auth_middleware.py bearer-token handling on protected paths.
+"""
+
+from unittest.mock import patch
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.utils.auth_middleware import AuthMiddleware
+from src.utils.security import create_jwt_token
+
+
+def _make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(AuthMiddleware, protected_paths=("/me",))
+
+    @app.get("/me")
+    async def me(request: Request):
+        return request.state.user
+
+    @app.get("/me/settings")
+    async def me_settings(request: Request):
+        return request.state.user
+
+    @app.get("/public")
+    async def public():
+        return {"ok": True}
+
+    @app.get("/metrics")
+    async def metrics():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+# =========================================================
+# 🔐 Protected Paths
+# =========================================================
+@patch("src.utils.auth_middleware.config.DEBUG", False)
+def test_valid_token_attaches_user():
+    token = create_jwt_token({"sub": "user123", "role": "analyst"})
+    response = _make_client().get("/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json() == {"user_id": "user123", "role": "analyst"}
+
+
+@patch("src.utils.auth_middleware.config.DEBUG", False)
+def test_missing_or_invalid_token_is_rejected():
+    client = _make_client()
+    assert client.get("/me").status_code == 401
+    response = client.get("/me", headers={"Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+
+# =========================================================
+# 🌐 Unprotected Paths
+# =========================================================
+@patch("src.utils.auth_middleware.config.DEBUG", False)
+def test_unprotected_path_passes_through():
+    assert _make_client().get("/public").json() == {"ok": True}
+
+
+@patch("src.utils.auth_middleware.config.DEBUG", False)
+def test_shared_prefix_is_not_protected():
+    # "/me" must not swallow "/metrics" (Prometheus scrapes carry no JWT)
+    client = _make_client()
+    assert client.get("/metrics").status_code == 200
+    assert client.get("/metrics/", follow_redirects=False).status_code != 401
+
+
+@patch("src.utils.auth_middleware.config.DEBUG", False)
+def test_sub_path_of_protected_path_requires_token():
+    assert _make_client().get("/me/settings").status_code == 401
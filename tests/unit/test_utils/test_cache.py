@@ -0,0 +1,60 @@
+"""
+Unit Tests: Cache
+-----------------
+Covers src/utils/cache.py RedisCache (local in-memory fallback).
+"""
+
+from unittest.mock import MagicMock, patch
+
+from src.utils.cache import RedisCache
+
+
+def _local_cache() -> RedisCache:
+    cache = RedisCache()
+    cache.client, cache.use_redis = None, False
+    cache._bind_backend()
+    return cache
+
+
+# =========================================================
+# 💾 Local Backend
+# =========================================================
+def test_local_set_get_delete_roundtrip():
+    cache = _local_cache()
+    cache.set("test:roundtrip", {"a": 1}, expire=60)
+    assert cache.get("test:roundtrip") == {"a": 1}
+    cache.delete("test:roundtrip")
+    assert cache.get("test:roundtrip") is None
+
+
+def test_set_error_is_logged_not_raised():
+    cache = _local_cache()
+    with patch("src.utils.cache._local_set", side_effect=TypeError("boom")), \
+         patch("src.utils.cache.logger.warning") as mock_warning:
+        assert cache.set("test:broken", object()) is None
+    mock_warning.assert_called_once()
+
+
+# =========================================================
+# 🧪 Patchability
+# =========================================================
+def test_class_level_patch_reaches_existing_instances():
+    cache = _local_cache()
+    with patch.object(RedisCache, "get", return_value="patched"):
+        assert cache.get("anything") == "patched"
+
+
+# =========================================================
+# 🔌 Backend Binding
+# =========================================================
+def test_redis_backend_is_bound_once_and_used():
+    cache = _local_cache()
+    cache.client = MagicMock()
+    cache.client.get.return_value = b'{"a": 1}'
+    cache.use_redis = True
+    cache._bind_backend()
+
+    assert cache.get("test:redis") == {"a": 1}
+    cache.delete("test:redis")
+    cache.client.get.assert_called_once_with("test:redis")
+    cache.client.delete.assert_called_once_with("test:redis")
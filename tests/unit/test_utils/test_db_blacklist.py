@@ -0,0 +1,46 @@
+"""
+Unit Tests: Blacklist Cache
+---------------------------
+Covers src/utils/db.py in-process blacklist snapshot (TTL cache + invalidation).
+"""
+
+from unittest.mock import MagicMock
+
+from src.utils.db import get_blacklist_providers, get_blacklist_set, invalidate_blacklist_cache
+
+
+def _db_with(*providers: str) -> MagicMock:
+    db = MagicMock()
+    db.execute.return_value.fetchall.return_value = [(p,) for p in providers]
+    return db
+
+
+def test_snapshot_is_reused_within_ttl():
+    db = _db_with("Shady_Clinic")
+    assert get_blacklist_providers(db) == ("shady_clinic",)
+    assert get_blacklist_set(db) == frozenset({"shady_clinic"})
+    assert db.execute.call_count == 1
+
+
+def test_invalidate_forces_reload():
+    get_blacklist_providers(_db_with("old_vendor"))
+    invalidate_blacklist_cache()
+
+    db = _db_with("new_vendor")
+    assert get_blacklist_set(db) == frozenset({"new_vendor"})
+    assert db.execute.call_count == 1
+
+
+def test_fixture_isolates_snapshot_between_tests():
+    # A previous test loaded a blacklist; the autouse fixture must have cleared it
+    db = _db_with("fresh_vendor")
+    assert get_blacklist_providers(db) == ("fresh_vendor",)
+    assert db.execute.call_count == 1
+
+
+def test_set_comes_from_the_snapshot_it_loaded(monkeypatch):
+    # TTL 0: every call reloads, and each must answer from its own load
+    monkeypatch.setattr("src.utils.db._BLACKLIST_TTL", 0)
+    assert get_blacklist_set(_db_with("vendor_a")) == frozenset({"vendor_a"})
+    assert get_blacklist_set(_db_with("vendor_b")) == frozenset({"vendor_b"})
+    assert get_blacklist_providers(_db_with("vendor_c")) == ("vendor_c",)
@@ -0,0 +1,46 @@
+"""
+Unit Tests: Claim Persistence
+-----------------------------
+Covers src/utils/db.py `save_claims_bulk` (batched INSERT ... RETURNING).
+"""
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.models.claim import ClaimData
+from src.models.fraud import AlarmSeverity, Decision, FraudAlarm
+from src.utils.db import _claims_table, save_claims_bulk
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    _claims_table.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+# =========================================================
+# 💾 Bulk Insert
+# =========================================================
+def test_save_claims_bulk_returns_ids_in_input_order(db):
+    alarm = FraudAlarm(type="high_amount", description="Amount > 10k", severity=AlarmSeverity.HIGH)
+    records = [
+        (ClaimData(claimant_id=f"c{i}", amount=100.0 * (i + 1), provider=f"p{i}"), 0.1 * i, Decision.APPROVE, [alarm])
+        for i in range(3)
+    ]
+
+    ids = save_claims_bulk(records, db)
+
+    assert ids == [1, 2, 3]
+    rows = db.execute(
+        select(_claims_table.c.id, _claims_table.c.claimant_id, _claims_table.c.alarms).order_by(_claims_table.c.id)
+    ).all()
+    assert [(r.id, r.claimant_id) for r in rows] == [(1, "c0"), (2, "c1"), (3, "c2")]
+    assert rows[0].alarms[0]["severity"] == "high"
+
+
+def test_save_claims_bulk_empty(db):
+    assert save_claims_bulk([], db) == []
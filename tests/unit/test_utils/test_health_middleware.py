@@ -0,0 +1,37 @@
+"""
+Unit Tests: Health Fast Path
+----------------------------
+Covers src/utils/health_middleware.py cache-served /health responses.
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.utils.health_middleware import HealthCache, HealthFastPath
+
+
+def _make_client(cache: HealthCache) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(HealthFastPath, cache=cache, max_age=10.0)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "from_route"}
+
+    return TestClient(app)
+
+
+# =========================================================
+# 🩺 Fast Path
+# =========================================================
+def test_fresh_cache_is_served_without_routing():
+    cache = HealthCache()
+    cache.update({"status": "healthy", "database": "ok"})
+    response = _make_client(cache).get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy", "database": "ok"}
+
+
+def test_empty_cache_falls_through_to_route():
+    response = _make_client(HealthCache()).get("/health")
+    assert response.json() == {"status": "from_route"}